@@ -9,6 +9,7 @@ import {
     type EnemyEvent
 } from '../api/scores'
 import { useTheme } from '../contexts/ThemeContext'
+import { decodeFrames, REPLAY_FORMAT, REPLAY_VERSION, type CompactFrameBlock } from '../utils/replayCodec'
 import { darkTheme, lightTheme } from '../theme/colors'
 
 // 게임 데이터 타입 정의 (Pyxel에서 받는 데이터)
@@ -20,6 +21,35 @@ interface GameData {
     enemy_events: EnemyEvent[]
 }
 
+// Pyxel이 저장하는 매니페스트 (프레임은 청크 키에 압축 블록으로 나뉘어 저장됨)
+interface GameDataManifest extends Omit<GameData, 'frames'> {
+    total_frames: number
+    chunk_frames: number
+    chunk_keys: string[]
+    format: string
+    version: number
+}
+
+// 청크를 순서대로 복원해 이어 붙임. 청크가 없거나 프레임 수가 맞지 않으면 실패
+function loadChunkedFrames(manifest: GameDataManifest): GamePlayFrame[] {
+    if (manifest.format !== REPLAY_FORMAT || manifest.version > REPLAY_VERSION) {
+        throw new Error(`unsupported game data format ${manifest.format} v${manifest.version}`)
+    }
+    const frames: GamePlayFrame[] = []
+    for (const key of manifest.chunk_keys) {
+        const chunk = localStorage.getItem(key)
+        if (chunk === null) {
+            throw new Error(`missing game data chunk ${key}`)
+        }
+        const block: CompactFrameBlock = JSON.parse(chunk)
+        for (const frame of decodeFrames(block, frames.length)) frames.push(frame)
+    }
+    if (frames.length !== manifest.total_frames) {
+        throw new Error(`game data has ${frames.length} frames, expected ${manifest.total_frames}`)
+    }
+    return frames
+}
+
 // window 객체 타입 확장
 declare global {
     interface Window {
@@ -40,6 +70,7 @@ export default function Play() {
     const [gameData, setGameData] = useState<GameData | null>(null)
     const [submitting, setSubmitting] = useState(false)
     const [submitMessage, setSubmitMessage] = useState('')
+    const [dataError, setDataError] = useState('')
 
     const pyxappUrl = useMemo(() => '/game.pyxapp', [])
     const iframeSrc = useMemo(
@@ -66,7 +97,25 @@ export default function Play() {
                 if (completed === 'true' && gameDataStr && timestamp !== lastTimestamp) {
                     console.log('Game completed detected!')
 
-                    const data: GameData = JSON.parse(gameDataStr)
+                    const manifest: GameDataManifest = JSON.parse(gameDataStr)
+                    let frames: GamePlayFrame[]
+                    try {
+                        frames = loadChunkedFrames(manifest)
+                    } catch (error) {
+                        // 잘린 기록은 제출하지 않음 (같은 완료 데이터는 다시 시도하지 않음)
+                        console.error('Invalid game data:', error)
+                        lastTimestamp = timestamp
+                        setDataError('⚠️ 게임 기록 일부가 손실되어 점수를 등록할 수 없습니다.')
+                        return
+                    }
+                    setDataError('')
+                    const data: GameData = {
+                        score: manifest.score,
+                        final_stage: manifest.final_stage,
+                        statistics: manifest.statistics,
+                        frames,
+                        enemy_events: manifest.enemy_events,
+                    }
                     console.log('Game data:', data)
 
                     setGameData(data)
@@ -79,6 +128,7 @@ export default function Play() {
                     // TODO: 나중에 다시 활성화
                     localStorage.removeItem('pyxelGameCompleted')
                     localStorage.removeItem('pyxelGameData')
+                    manifest.chunk_keys.forEach((key) => localStorage.removeItem(key))
                 }
             } catch (error) {
                 console.error('Failed to check game completion:', error)
@@ -463,6 +513,22 @@ export default function Play() {
                 </div>
             </div>
 
+            {dataError && (
+                <div style={{
+                    width: '100%',
+                    maxWidth: 768,
+                    marginTop: 32,
+                    padding: 12,
+                    borderRadius: 8,
+                    background: colors.errorBg,
+                    textAlign: 'center',
+                    fontWeight: 500,
+                    color: colors.text
+                }}>
+                    {dataError}
+                </div>
+            )}
+
             {showSubmit && gameData && (
                 <div style={{
                     display: 'grid',
@@ -0,0 +1,113 @@
+import type { GamePlayFrame } from '../api/scores'
+
+// src/replay_codec.py 의 압축 프레임 블록(encode_columns) 복원
+export const REPLAY_FORMAT = 'vortexion-replay'
+export const REPLAY_VERSION = 1
+
+export type CompactFrameBlock = {
+    frame_count: number
+    keyframe_interval: number
+    inputs: number[]
+    positions: [number, number, number][]
+    lives: number[]
+    score: number[]
+    weapon: number[]
+    stage: number[]
+    clock: number[]
+}
+
+// src/const.py, src/player.py, src/input.py 와 같은 값
+const APP_WIDTH = 256
+const APP_HEIGHT = 192
+const PLAYER_W = 16
+const PLAYER_H = 8
+const MOVE_SPEED = 2
+const MOVE_SPEED_DIAGONAL = MOVE_SPEED * 0.707
+const TIMESTAMP_FPS = 30.0
+
+const UP = 0
+const DOWN = 1
+const LEFT = 2
+const RIGHT = 3
+const BUTTON_1 = 4
+const BUTTON_2 = 5
+
+function rleDecode(runs: number[]): number[] {
+    const out: number[] = []
+    for (let i = 0; i < runs.length; i += 2) {
+        for (let j = 0; j < runs[i + 1]; j++) out.push(runs[i])
+    }
+    return out
+}
+
+// player.moved_position + replay_codec.predict_position
+function predictPosition(x: number, y: number, inputs: number): [number, number] {
+    let moveX = 0
+    let moveY = 0
+    if (inputs & (1 << LEFT)) moveX = -1
+    else if (inputs & (1 << RIGHT)) moveX = 1
+    if (inputs & (1 << UP)) moveY = -1
+    else if (inputs & (1 << DOWN)) moveY = 1
+
+    if (moveX !== 0 && moveY !== 0) {
+        x = Math.max(0, Math.min(APP_WIDTH - PLAYER_W, x + moveX * MOVE_SPEED_DIAGONAL))
+        y = Math.max(16, Math.min(APP_HEIGHT - 16 - PLAYER_H, y + moveY * MOVE_SPEED_DIAGONAL))
+    } else if (moveX !== 0) {
+        x = Math.max(0, Math.min(APP_WIDTH - PLAYER_W, x + moveX * MOVE_SPEED))
+    } else if (moveY !== 0) {
+        y = Math.max(16, Math.min(APP_HEIGHT - 16 - PLAYER_H, y + moveY * MOVE_SPEED))
+    }
+    return [x, y]
+}
+
+/**
+ * 압축 블록 -> 프레임 목록 (replay_codec.decode_frames)
+ * start: 녹화 전체에서 블록이 시작하는 프레임 번호
+ */
+export function decodeFrames(block: CompactFrameBlock, start = 0): GamePlayFrame[] {
+    const n = block.frame_count
+    const inputs = rleDecode(block.inputs)
+    const lives = rleDecode(block.lives)
+    const score = rleDecode(block.score)
+    const weapon = rleDecode(block.weapon)
+    const stage = rleDecode(block.stage)
+    const clockDeltas = rleDecode(block.clock)
+    if ([inputs, lives, score, weapon, stage, clockDeltas].some((c) => c.length !== n)) {
+        throw new Error(`corrupt replay block at frame ${start}`)
+    }
+
+    const keyframes = new Map<number, [number, number]>()
+    for (const [i, kx, ky] of block.positions) keyframes.set(i, [kx, ky])
+    if (n > 0 && !keyframes.has(0)) {
+        throw new Error(`replay block at frame ${start} has no first keyframe`)
+    }
+
+    const frames: GamePlayFrame[] = []
+    let x = 0
+    let y = 0
+    let clock = 0
+    for (let i = 0; i < n; i++) {
+        const key = keyframes.get(i)
+        if (key) [x, y] = key
+        else [x, y] = predictPosition(x, y, inputs[i - 1])
+        clock += clockDeltas[i]
+        const bits = inputs[i]
+        frames.push({
+            frame_number: start + i,
+            player_x: x,
+            player_y: y,
+            player_lives: lives[i],
+            player_score: score[i],
+            current_weapon: weapon[i],
+            input_left: (bits >> LEFT) & 1,
+            input_right: (bits >> RIGHT) & 1,
+            input_up: (bits >> UP) & 1,
+            input_down: (bits >> DOWN) & 1,
+            input_button1: (bits >> BUTTON_1) & 1,
+            input_button2: (bits >> BUTTON_2) & 1,
+            stage_num: stage[i],
+            timestamp: clock / TIMESTAMP_FPS,
+        })
+    }
+    return frames
+}
@@ -7,6 +7,7 @@ import pyxel as px
 # Title screen music is all channels (0-3)
 # In-stage music is channels 0-2
 SOUND_CHANNEL = 3
+MUSIC_CHANNELS = 3
 # Sounds (not channels) 0-3 used when music loaded from JSON.
 class SoundType(IntEnum):
     RESERVED_MUSIC_0 = 0
@@ -32,11 +33,42 @@ SOUND_CHANNEL_GAIN_DEFAULT = 0.125
 
 last_sound_played = 0
 
+# Headless simulation runs without a Pyxel audio device.
+enabled = True
+
+# Fast-forward playback: music channels muted, and the sounds of all the
+# updates in one presented frame coalesced into the most important one.
+fast_forward = False
+pending_sound = None  # (sound, doLoop, priority)
+music_gain = SOUND_CHANNEL_GAIN_DEFAULT
+
+def set_enabled(on):
+    global enabled
+    enabled = on
+
+def set_fast_forward(on):
+    global fast_forward, pending_sound
+    if on == fast_forward:
+        return
+    fast_forward = on
+    pending_sound = None
+    if enabled:
+        apply_music_gain(MUSIC_CHANNELS)
+
+def apply_music_gain(num_channels=4):
+    gain = 0 if fast_forward else music_gain
+    for i in range(num_channels):
+        px.channels[i].gain = gain
+
 def load_music(file):
+    if not enabled:
+        return []
     with open(f"assets/{file}", "rt") as fin:
         return json.loads(fin.read())
     
 def play_music(music, doLoop=True, num_channels=4, theTick=None):
+    if not enabled:
+        return
     for ch, sound in enumerate(music):
         px.sounds[ch].set(*sound)
         px.play(ch, ch, tick=theTick, loop=doLoop)
@@ -44,27 +76,48 @@ def play_music(music, doLoop=True, num_channels=4, theTick=None):
             break
         
 def reset_music_gain(num_channels=4):
-    for i in range(num_channels):
-        px.channels[i].gain = SOUND_CHANNEL_GAIN_DEFAULT
+    global music_gain
+    music_gain = SOUND_CHANNEL_GAIN_DEFAULT
+    if not enabled:
+        return
+    apply_music_gain(num_channels)
 
 def fade_out_music(gain, num_channels=4):
+    global music_gain
     if gain > 0:
         gain = max(0, gain - 0.001)
         if gain == 0:
             stop_music(num_channels)
-        else:
-            for i in range(num_channels):
-                px.channels[i].gain = gain
+        elif enabled:
+            music_gain = gain
+            apply_music_gain(num_channels)
     return gain
         
 def stop_music(num_channels=4):
+    if not enabled:
+        return
     for i in range(num_channels):
         px.stop(i)
         
 def is_music_playing():
+    if not enabled:
+        return False
     return px.play_pos(0) is not None
 
 def play_sound(sound, doLoop=False, priority=False):
+    global pending_sound
+    if not enabled:
+        return
+    if fast_forward:
+        # keep the one that would have ended up playing
+        if pending_sound is None or priority or \
+                (not pending_sound[2] and
+                 SND_PRIORITY[sound] >= SND_PRIORITY[pending_sound[0]]):
+            pending_sound = (sound, doLoop, priority)
+        return
+    start_sound(sound, doLoop, priority)
+
+def start_sound(sound, doLoop, priority):
     global last_sound_played
     if px.play_pos(SOUND_CHANNEL) is None:
         px.play(SOUND_CHANNEL, snd=sound, loop=doLoop)
@@ -74,5 +127,17 @@ def play_sound(sound, doLoop=False, priority=False):
             px.play(SOUND_CHANNEL, snd=sound, loop=doLoop)
             last_sound_played = sound
 
+def flush_sounds():
+    """Play the sound coalesced during a fast-forwarded frame."""
+    global pending_sound
+    if pending_sound is None:
+        return
+    sound, doLoop, priority = pending_sound
+    pending_sound = None
+    if enabled:
+        start_sound(sound, doLoop, priority)
+
 def stop_sound():
+    if not enabled:
+        return
     px.stop(SOUND_CHANNEL)
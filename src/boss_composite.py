@@ -0,0 +1,60 @@
+"""Boss sprites pre-rendered into a spare image bank.
+
+A boss is one 16x16 quadrant of image bank 0 mirrored into a 32x32 sprite,
+with three of the quadrants palette swapped to their own colours, and the
+whole sprite swapped to white while it flashes on hit. `bake_all` draws
+both versions of every boss into `BANK` once per process, the first time
+a boss is drawn (headless runs never pay for it), so a boss draws with a
+single `px.blt` and no `px.pal` calls.
+"""
+import pyxel as px
+
+BANK = 1
+SIZE = 32
+HIT_V = SIZE  # hit versions sit below the normal ones
+HIT_COLOUR = 15
+
+_composites = []
+_baked = False
+
+
+class BossComposite:
+    def __init__(self, u, v, colour, quadrant_colours) -> None:
+        """`quadrant_colours`: what `colour` becomes in the top right,
+        bottom left and bottom right quadrants."""
+        self.src_u = u
+        self.src_v = v
+        self.colour = colour
+        self.quadrant_colours = quadrant_colours
+        self.u = len(_composites) * SIZE  # in BANK
+        _composites.append(self)
+
+    def bake(self):
+        img = px.images[BANK]
+        half = SIZE // 2
+        top_right, bottom_left, bottom_right = self.quadrant_colours
+        for v, colours in ((0, (self.colour, top_right, bottom_left,
+                                bottom_right)),
+                           (HIT_V, (HIT_COLOUR,) * 4)):
+            img.rect(self.u, v, SIZE, SIZE, 0)
+            for (dx, dy, w, h), c in zip(((0, 0, half, half),
+                                          (half, 0, -half, half),
+                                          (0, half, half, -half),
+                                          (half, half, -half, -half)),
+                                         colours):
+                img.pal(self.colour, c)
+                img.blt(self.u + dx, v + dy, 0, self.src_u, self.src_v,
+                        w, h, 0)
+            img.pal()
+
+    def draw(self, x, y, is_hit):
+        if not _baked:
+            bake_all()
+        px.blt(x, y, BANK, self.u, HIT_V if is_hit else 0, SIZE, SIZE, 0)
+
+
+def bake_all():
+    global _baked
+    _baked = True
+    for c in _composites:
+        c.bake()
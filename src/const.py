@@ -9,6 +9,11 @@ APP_DISPLAY_SCALE = 2
 APP_CAPTURE_SCALE = 2
 APP_GFX_FILE = "gfx.png"
 
+# Game updates per presented frame (fast-forward replay viewing).
+PLAYBACK_SPEEDS = (1, 2, 4, 8, 16)
+PLAYBACK_MAX = 0  # as many updates as fit in PLAYBACK_MAX_BUDGET
+PLAYBACK_MAX_BUDGET = 0.8 / APP_FPS  # seconds per presented frame
+
 
 class StageNum(IntEnum):
     STAGE_1 = auto()  # = 1
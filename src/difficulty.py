@@ -0,0 +1,136 @@
+"""Runtime difficulty: a parameter block the stage reads, and a controller
+that moves it with the player's recent performance.
+
+`Difficulty` holds multipliers on the design values (1.0 = the game as
+designed) of enemy hp (applied at spawn), enemy bullet speed and fire
+interval and scroll speed, plus the number of kills between powerups. It
+lives on `GameVars`, so it carries over between stages; the stage and its
+sprites read it every frame. `set_level` maps one number from -1 (easiest)
+through 0 (as designed) to 1 (hardest) onto all of it.
+
+`DifficultyController` looks at the stage's hit, kill and death counters
+after every update played in the PLAY state, keeps per-frame counts for a
+rolling window in ring buffers with running totals (O(1) per frame), and
+nudges the level: down while the player keeps getting hit or has just
+died, up while they kill without being touched. The level carries over between the stages of one
+game; `reset` puts it back to where the controller started, for a new
+game, a continue or an episode.
+"""
+from powerup import MAX_CYCLE_GAP_LEN
+
+# field: (easiest, hardest) multiplier, reached at level -1 and 1
+LEVEL_RANGES = {
+    "enemy_hp": (0.5, 2.0),
+    "bullet_speed": (0.7, 1.4),
+    "fire_interval": (1.5, 0.6),
+    "scroll_speed": (0.8, 1.25),
+}
+
+WINDOW_FRAMES = 600  # 10 seconds
+LEVEL_RATE = 1 / 1800  # level change per frame, -1 to 1 in a minute
+MAX_HITS = 1  # hits in the window above which it gets easier
+MIN_KILLS = 5  # kills without a hit in the window for it to get harder
+
+
+class Difficulty:
+    __slots__ = ("level", "enemy_hp", "bullet_speed", "fire_interval",
+                 "scroll_speed", "powerup_gap")
+
+    def __init__(self) -> None:
+        self.powerup_gap = MAX_CYCLE_GAP_LEN
+        self.set_level(0.0)
+
+    def set_level(self, level):
+        level = min(1.0, max(-1.0, level))
+        self.level = level
+        for name, (easiest, hardest) in LEVEL_RANGES.items():
+            end = hardest if level > 0 else easiest
+            setattr(self, name, 1.0 + (end - 1.0) * abs(level))
+
+    def scale_hp(self, hp):
+        return max(1, int(hp * self.enemy_hp + 0.5))
+
+    def scale_interval(self, frames):
+        return max(1, int(frames * self.fire_interval + 0.5))
+
+    def values(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def set_values(self, values):
+        for name, v in zip(self.__slots__, values):
+            setattr(self, name, v)
+
+
+class DifficultyController:
+    def __init__(self, difficulty, window=WINDOW_FRAMES, rate=LEVEL_RATE,
+                 max_hits=MAX_HITS, min_kills=MIN_KILLS,
+                 start_level=None) -> None:
+        self.difficulty = difficulty
+        self.start_level = \
+            difficulty.level if start_level is None else start_level
+        self.window = window
+        self.rate = rate
+        self.max_hits = max_hits
+        self.min_kills = min_kills
+
+        self.hits = [0] * window
+        self.kills = [0] * window
+        self.pos = 0
+        self.hit_total = 0
+        self.kill_total = 0
+        self.frames_since_death = window
+        self._stage = None
+        self._last = None  # its counters at the previous update
+
+    def reset(self):
+        """Back to `start_level` with an empty window, for a new game."""
+        self.difficulty.set_level(self.start_level)
+        self.hits = [0] * self.window
+        self.kills = [0] * self.window
+        self.pos = 0
+        self.hit_total = 0
+        self.kill_total = 0
+        self.frames_since_death = self.window
+        self._stage = None
+        self._last = None
+
+    def update(self, stage):
+        """Call after every stage update made in the PLAY state; paused,
+        dying and cleared frames don't count towards the window."""
+        counters = (stage.hits_taken, stage.kills, stage.deaths)
+        last = self._last
+        self._last = counters
+        if stage is not self._stage:
+            self._stage = stage  # a new stage's counters start at 0
+            return
+        hits = counters[0] - last[0]
+        kills = counters[1] - last[1]
+
+        pos = self.pos
+        self.hit_total += hits - self.hits[pos]
+        self.kill_total += kills - self.kills[pos]
+        self.hits[pos] = hits
+        self.kills[pos] = kills
+        self.pos = (pos + 1) % self.window
+
+        if counters[2] > last[2]:
+            self.frames_since_death = 0
+        else:
+            self.frames_since_death += 1
+
+        level = self.difficulty.level
+        if self.hit_total > self.max_hits or \
+                self.frames_since_death < self.window:
+            if level > -1.0:
+                self.difficulty.set_level(level - self.rate)
+        elif self.hit_total == 0 and self.kill_total >= self.min_kills:
+            if level < 1.0:
+                self.difficulty.set_level(level + self.rate)
+
+    def metrics(self):
+        return {
+            "level": self.difficulty.level,
+            "hits": self.hit_total,
+            "kills": self.kill_total,
+            "frames_since_death": self.frames_since_death,
+        }
@@ -4,7 +4,6 @@ import pyxel as px
 from sprite import Sprite
 from const import EntityType, ENEMY_SCORE_NORMAL, BOMB_DAMAGE, \
     PLAYER_SHOT_DAMAGE
-from enemy_shot import EnemyShot
 import powerup
 from audio import play_sound, SoundType
 
@@ -12,6 +11,8 @@ HIT_FRAMES = 5
 INVINCIBLE_START_FRAMES = 15
 
 class Enemy(Sprite):
+    __slots__ = ("type", "hp", "hit_frames", "score", "lifetime", "enemy_id")
+
     def __init__(self, game_state, x, y, enemy_id: int = -1) -> None:
         super().__init__(game_state)
         self.type = EntityType.ENEMY
@@ -30,6 +31,7 @@ class Enemy(Sprite):
         if self.remove:
             return
         self.remove = True
+        self.game_state.kills += 1
         self.game_state.add_score(self.score)
         self.explode()
         powerup.check_create_next(self.game_state, self.x, self.y)
@@ -54,13 +56,13 @@ class Enemy(Sprite):
 
     # Offsets are from centre x and y of enemy
     def shoot_at_angle(self, speed, degrees, delay=0, offset_x=0, offset_y=0):
+        speed *= self.game_state.difficulty.bullet_speed
         shot_x = self.x + (self.w/2) + offset_x
         shot_y = self.y + (self.h/2) + offset_y
         vx = px.cos(degrees) * speed
         vy = px.sin(degrees) * speed
         
-        s = EnemyShot(self.game_state, shot_x, shot_y, vx, vy, delay)
-        self.game_state.add_enemy_shot(s)
+        self.game_state.spawn_enemy_shot(shot_x, shot_y, vx, vy, delay)
         
         # 적 공격 이벤트 기록
         if hasattr(self.game_state, 'game') and hasattr(self.game_state.game, 'data_collector'):
@@ -75,6 +77,11 @@ class Enemy(Sprite):
                      target_x - (self.x + self.w/2))
         self.shoot_at_angle(speed, a, delay)
 
+    def is_fire_frame(self, interval):
+        """Every `interval` frames of lifetime, scaled by the difficulty."""
+        return self.lifetime % \
+            self.game_state.difficulty.scale_interval(interval) == 0
+
     def update(self):
         self.lifetime += 1
         if self.hit_frames > 0:
@@ -7,6 +7,8 @@ BULLET_SPEED = 2
 SHOT_DELAY = 120
 
 class EnemyA(Enemy):
+    __slots__ = ("shot_delay",)
+
     def __init__(self, state, x, y, enemy_id: int = -1) -> None:
         super().__init__(state, x, y, enemy_id)
         self.colour = 7 # cyan
@@ -24,7 +26,8 @@ class EnemyA(Enemy):
             return
 
         if self.shot_delay == 0:
-            self.shot_delay = SHOT_DELAY
+            self.shot_delay = \
+                self.game_state.difficulty.scale_interval(SHOT_DELAY)
             self.shoot_at_angle(BULLET_SPEED, 180, 0, -8, -10)
             self.shoot_at_angle(BULLET_SPEED, 180, 0, -8, 6)
         else:
@@ -9,6 +9,8 @@ SPEED = 1.5
 BULLET_SPEED = 2
 
 class EnemyB(Enemy):
+    __slots__ = ()
+
     def __init__(self, state, x, y, enemy_id: int = -1) -> None:
         super().__init__(state, x, y, enemy_id)
         self.colour = 3 # light green
@@ -4,6 +4,8 @@ from enemy import Enemy
 BULLET_SPEED = 2
 
 class EnemyC(Enemy):
+    __slots__ = ("speed",)
+
     def __init__(self, state, x, y, enemy_id: int = -1) -> None:
         super().__init__(state, x, y, enemy_id)
         self.colour = 13 # purple
@@ -4,6 +4,8 @@ from enemy import Enemy
 SPEED_Y = 1.5
 
 class EnemyG(Enemy):
+    __slots__ = ("speed",)
+
     def __init__(self, state, x, y, enemy_id: int = -1) -> None:
         super().__init__(state, x, y, enemy_id)
         self.colour = 9 # pink
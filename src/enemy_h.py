@@ -6,6 +6,8 @@ GRAVITY = 0.2
 
 
 class EnemyH(Enemy):
+    __slots__ = ("vel_y",)
+
     def __init__(self, state, x, y, enemy_id: int = -1) -> None:
         super().__init__(state, x, y, enemy_id)
         self.colour = 6  # red
@@ -4,6 +4,8 @@ BULLET_SPEED = 1.5
 
 
 class EnemyJ(Enemy):
+    __slots__ = ("speed_x",)
+
     def __init__(self, state, x, y, enemy_id: int = -1) -> None:
         super().__init__(state, x, y, enemy_id)
         self.colour = 13  # purple
@@ -24,7 +26,7 @@ class EnemyJ(Enemy):
             self.remove = True
             return
 
-        if self.lifetime % 120 == 0:
+        if self.is_fire_frame(120):
             self.shoot_at_angle(BULLET_SPEED, 210)
             self.shoot_at_angle(BULLET_SPEED, 195, 10)
             self.shoot_at_angle(BULLET_SPEED, 180, 20)
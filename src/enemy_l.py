@@ -1,13 +1,17 @@
-import pyxel as px
-
 from enemy import Enemy
 from const import ENEMY_SCORE_BOSS
+from boss_composite import BossComposite
 
 BULLET_SPEED = 1.5
 
 
 # Boss: large leaves
 class EnemyL(Enemy):
+    # top right, bottom left, bottom right: green, dark green, light blue
+    COMPOSITE = BossComposite(176, 80, 3, (2, 12, 5))
+
+    __slots__ = ("speed_x",)
+
     def __init__(self, state, x, y, enemy_id: int = -1) -> None:
         super().__init__(state, x, y, enemy_id)
         self.colour = 3  # light green
@@ -33,45 +37,22 @@ class EnemyL(Enemy):
         self.x -= self.speed_x
 
         if self.game_state.get_num_enemies() == 0:
-            if self.lifetime % 60 == 0:
+            if self.is_fire_frame(60):
                 self.shoot()
         else:
-            if self.lifetime % 200 == 0:
+            if self.is_fire_frame(200):
                 self.shoot()
 
     def explode(self):
+        rng = self.game_state.rng
         for i in range(6):
             self.game_state.add_explosion(
-                self.x + 8 + px.rndi(-12, 12), self.y + 8 + px.rndi(-6, 6), i * 5
+                self.x + 8 + rng.rndi(-12, 12), self.y + 8 + rng.rndi(-6, 6), i * 5
             )
 
     def destroy(self):
         super().destroy()
         self.game_state.check_stage_clear = True
 
-    def draw_composite(self, is_hit):
-        # top left
-        px.blt(self.x, self.y, 0, self.u, self.v, 16, 16, 0)
-        # top right
-        if not is_hit:
-            px.pal(self.colour, 2)  # green
-        px.blt(self.x + 16, self.y, 0, self.u, self.v, -16, 16, 0)
-        # bottom left
-        if not is_hit:
-            px.pal(self.colour, 12)  # dark green
-        px.blt(self.x, self.y + 16, 0, self.u, self.v, 16, -16, 0)
-        # bottom right
-        if not is_hit:
-            px.pal(self.colour, 5)  # lght blue
-        px.blt(self.x + 16, self.y + 16, 0, self.u, self.v, -16, -16, 0)
-
-        if not is_hit:
-            px.pal()
-
     def draw(self):
-        if self.hit_frames > 0:
-            px.pal(self.colour, 15)
-            self.draw_composite(True)
-            px.pal()
-        else:
-            self.draw_composite(False)
+        self.COMPOSITE.draw(self.x, self.y, self.hit_frames > 0)
@@ -5,6 +5,8 @@ SPEED_Y = 0.5
 
 
 class EnemyN(Enemy):
+    __slots__ = ("speed_y",)
+
     def __init__(self, state, x, y, enemy_id: int = -1) -> None:
         super().__init__(state, x, y, enemy_id)
         self.colour = 14  # grey
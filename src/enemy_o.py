@@ -7,6 +7,8 @@ SHOT_DELAY = 120
 
 
 class EnemyO(Enemy):
+    __slots__ = ("shot_delay",)
+
     def __init__(self, state, x, y, enemy_id: int = -1) -> None:
         super().__init__(state, x, y, enemy_id)
         self.colour = 7  # cyan
@@ -26,7 +28,8 @@ class EnemyO(Enemy):
             return
 
         if self.shot_delay == 0:
-            self.shot_delay = SHOT_DELAY
+            self.shot_delay = \
+                self.game_state.difficulty.scale_interval(SHOT_DELAY)
             self.shoot_at_player(BULLET_SPEED)
         else:
             self.shot_delay -= 1
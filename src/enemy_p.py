@@ -7,6 +7,8 @@ BULLET_SPEED = 4
 SHOT_DELAY = 120
 
 class EnemyP(Enemy):
+    __slots__ = ("shot_delay",)
+
     def __init__(self, state, x, y, enemy_id: int = -1) -> None:
         super().__init__(state, x, y, enemy_id)
         self.colour = 9 # pink
@@ -24,7 +26,8 @@ class EnemyP(Enemy):
             return
 
         if self.shot_delay == 0:
-            self.shot_delay = SHOT_DELAY
+            self.shot_delay = \
+                self.game_state.difficulty.scale_interval(SHOT_DELAY)
             self.shoot_at_angle(BULLET_SPEED, 190)
             self.shoot_at_angle(BULLET_SPEED, 170)
         else:
@@ -7,6 +7,8 @@ from sprite import Sprite
 SIZE = 4
 
 class EnemyShot(Sprite):
+    __slots__ = ("type", "vx", "vy", "delay")
+
     def __init__(self, game_state, x, y, vx, vy, delay=0) -> None:
         super().__init__(game_state)
         self.type = EntityType.ENEMY_SHOT
@@ -52,7 +54,7 @@ class EnemyShot(Sprite):
             self.remove = True
             return
 
-        if px.frame_count % 10 == 0:
+        if self.game_state.frame_count % 10 == 0:
             self.colour = 11 if (self.colour == 6) else 6
 
     def draw(self):
@@ -0,0 +1,362 @@
+"""Enemy shots of a stage as parallel NumPy arrays.
+
+A drop-in for the stage's list of `EnemyShot`: the same spawn order,
+movement, background test, culling, colour flashing, player collision and
+removal timing, but each step runs as a few array passes instead of a
+Python call per shot. `GameStateStage(..., batched_shots=True)` selects it.
+
+For code that reads shots one by one (observations, snapshots) the
+container iterates as `EnemyShot` sprites built from the arrays, and
+`shots[:] = sprites` loads them back.
+
+`SharedEnemyShots` holds the shots of several stages (`vec_env`) in one
+set of arrays tagged with an env index, so a frame of every stage's shots
+is one update and one player collision pass. Each stage sees its own
+shots through an `EnemyShotView` with the `EnemyShotArrays` interface.
+"""
+import numpy as np
+import pyxel as px
+
+from const import APP_WIDTH, EntityType
+from enemy_shot import EnemyShot, SIZE
+
+INITIAL_CAPACITY = 128
+COLOUR = 11  # yellow
+FLASH_COLOUR = 6
+U = 6
+V = 102
+
+
+class _ShotProxy:
+    """What `Player.collided_with` sees of a shot."""
+    type = EntityType.ENEMY_SHOT
+
+
+_shot_proxy = _ShotProxy()
+
+
+class EnemyShotArrays:
+    COLUMNS = (
+        ("x", np.float64),
+        ("y", np.float64),
+        ("vx", np.float64),
+        ("vy", np.float64),
+        ("delay", np.int64),
+        ("colour", np.uint8),
+        ("remove", np.bool_),
+    )
+
+    def __init__(self, game_state, capacity=INITIAL_CAPACITY) -> None:
+        self.game_state = game_state
+        self.count = 0
+        self._alloc(capacity)
+
+    def _alloc(self, capacity):
+        old = self.count
+        for name, dtype in self.COLUMNS:
+            a = np.zeros(capacity, dtype=dtype)
+            if old:
+                a[:old] = getattr(self, name)[:old]
+            setattr(self, name, a)
+        self.capacity = capacity
+
+    def __len__(self):
+        return self.count
+
+    def spawn(self, x, y, vx, vy, delay=0):
+        i = self.count
+        if i == self.capacity:
+            self._alloc(self.capacity * 2)
+        self.x[i] = x
+        self.y[i] = y
+        self.vx[i] = vx
+        self.vy[i] = vy
+        self.delay[i] = delay
+        self.colour[i] = COLOUR
+        self.remove[i] = False
+        self.count = i + 1
+
+    def clear(self):
+        self.count = 0
+
+    def _compact(self):
+        self._keep(~self.remove[:self.count])
+
+    def _keep(self, keep):
+        """Drop the rows where `keep` is False, keeping the order."""
+        n = self.count
+        m = int(np.count_nonzero(keep))
+        if m == n:
+            return
+        for name, _ in self.COLUMNS:
+            a = getattr(self, name)
+            a[:m] = a[:n][keep]
+        self.count = m
+
+    def update(self):
+        """`EnemyShot.update` for every shot, then drop removed ones."""
+        n = self.count
+        if n == 0:
+            return
+        x = self.x[:n]
+        y = self.y[:n]
+        delay = self.delay[:n]
+
+        waiting = delay > 0
+        delay[waiting] -= 1
+        moving = ~waiting
+        x[moving] += self.vx[:n][moving]
+        y[moving] += self.vy[:n][moving]
+
+        # Touching the background only skips the rest of the update.
+        bg = self.game_state.background
+        rest = moving & ~bg.are_points_colliding(x + 2, y + 2)
+        out = rest & ((x > APP_WIDTH) | (x + SIZE < 0) |
+                      (y < 16) | (y + SIZE >= 176))
+        self.remove[:n] |= out
+
+        if self.game_state.frame_count % 10 == 0:
+            flash = rest & ~out
+            colour = self.colour[:n]
+            colour[flash] = np.where(colour[flash] == FLASH_COLOUR,
+                                     COLOUR, FLASH_COLOUR)
+
+        self._compact()
+
+    def collide_sprite(self, spr):
+        """`sprite_collide_list(spr, shots)`."""
+        if spr.remove or self.count == 0:
+            return
+        n = self.count
+        x = self.x[:n]
+        y = self.y[:n]
+        hits = ~self.remove[:n] & (spr.x < x + SIZE) & \
+            (spr.x + spr.w > x) & (spr.y < y + SIZE) & (spr.y + spr.h > y)
+        for i in np.flatnonzero(hits):
+            spr.collided_with(_shot_proxy)
+            # EnemyShot.collided_with
+            if self.delay[i] > 0:
+                continue
+            if spr.type == EntityType.PLAYER and not spr.is_invincible():
+                self.remove[i] = True
+
+    def draw(self):
+        for i in range(self.count):
+            if self.delay[i] > 0:
+                continue
+            px.pal(15, int(self.colour[i]))
+            px.blt(float(self.x[i]), float(self.y[i]), 0,
+                   U, V, SIZE, SIZE, 0)
+            px.pal()
+
+    def sprite(self, i):
+        """Shot `i` as an `EnemyShot` (a copy, not a view)."""
+        s = EnemyShot(self.game_state, float(self.x[i]), float(self.y[i]),
+                      float(self.vx[i]), float(self.vy[i]),
+                      int(self.delay[i]))
+        s.colour = int(self.colour[i])
+        s.remove = bool(self.remove[i])
+        return s
+
+    def __iter__(self):
+        return (self.sprite(i) for i in range(self.count))
+
+    def __setitem__(self, index, sprites):
+        if index != slice(None):
+            raise IndexError("only shots[:] = sprites is supported")
+        self.clear()
+        for s in sprites:
+            self.spawn(s.x, s.y, s.vx, s.vy, s.delay)
+            self.colour[self.count - 1] = s.colour
+            self.remove[self.count - 1] = s.remove
+
+
+class SharedEnemyShots(EnemyShotArrays):
+    """Enemy shots of `num_envs` stages of the same map, tagged by env.
+
+    `update` and `collide_players` step the shots of every env marked in
+    `active` at once, with the same results as each stage running its own
+    `EnemyShotArrays`: rows keep spawn order within an env, and shots of
+    inactive envs (paused, game over) are left exactly as they are.
+    """
+    COLUMNS = EnemyShotArrays.COLUMNS + (("env", np.int32),)
+
+    def __init__(self, num_envs, capacity=INITIAL_CAPACITY) -> None:
+        super().__init__(None, capacity)
+        self.num_envs = num_envs
+        self.counts = np.zeros(num_envs, dtype=np.int64)
+        self._player_rects = np.zeros((4, num_envs), dtype=np.float64)
+        self._player_ok = np.zeros(num_envs, dtype=np.bool_)
+
+    def view(self, env, stage):
+        return EnemyShotView(self, env, stage)
+
+    def slot(self, env):
+        """Container factory for `GameStateStage(game, batched_shots=...)`."""
+        return lambda stage: self.view(env, stage)
+
+    def spawn_env(self, env, x, y, vx, vy, delay=0):
+        self.spawn(x, y, vx, vy, delay)
+        self.env[self.count - 1] = env
+        self.counts[env] += 1
+
+    def clear(self):
+        super().clear()
+        self.counts[:] = 0
+
+    def clear_env(self, env):
+        if self.counts[env]:
+            self._keep(self.env[:self.count] != env)
+            self.counts[env] = 0
+
+    def indices(self, env):
+        return np.flatnonzero(self.env[:self.count] == env)
+
+    def _recount(self):
+        self.counts[:] = np.bincount(self.env[:self.count],
+                                     minlength=self.num_envs)
+
+    def update_envs(self, active, frame_counts, background):
+        """`EnemyShotArrays.update` of every env with `active[env]`.
+        `frame_counts[env]` is that stage's clock; all envs share the map
+        of `background`."""
+        n = self.count
+        if n == 0:
+            return
+        env = self.env[:n]
+        act = active[env]
+        x = self.x[:n]
+        y = self.y[:n]
+        delay = self.delay[:n]
+
+        waiting = delay > 0
+        delay[act & waiting] -= 1
+        moving = act & ~waiting
+        x[moving] += self.vx[:n][moving]
+        y[moving] += self.vy[:n][moving]
+
+        rest = moving & ~background.are_points_colliding(x + 2, y + 2)
+        out = rest & ((x > APP_WIDTH) | (x + SIZE < 0) |
+                      (y < 16) | (y + SIZE >= 176))
+        remove = self.remove[:n]
+        remove |= out
+
+        flash = rest & ~out & (frame_counts[env] % 10 == 0)
+        if flash.any():
+            colour = self.colour[:n]
+            colour[flash] = np.where(colour[flash] == FLASH_COLOUR,
+                                     COLOUR, FLASH_COLOUR)
+
+        dropped = remove & act
+        if dropped.any():
+            self._keep(~dropped)
+            self._recount()
+
+    def collide_players(self, active, players):
+        """`collide_sprite(players[env])` for every env with
+        `active[env]`."""
+        n = self.count
+        if n == 0:
+            return
+        rects = self._player_rects
+        ok = self._player_ok
+        for e, p in enumerate(players):
+            ok[e] = active[e] and not p.remove
+            rects[0, e] = p.x
+            rects[1, e] = p.y
+            rects[2, e] = p.x + p.w
+            rects[3, e] = p.y + p.h
+        env = self.env[:n]
+        x = self.x[:n]
+        y = self.y[:n]
+        hits = ok[env] & ~self.remove[:n] & \
+            (rects[0][env] < x + SIZE) & (rects[2][env] > x) & \
+            (rects[1][env] < y + SIZE) & (rects[3][env] > y)
+        for i in np.flatnonzero(hits):
+            self._hit(players[env[i]], i)
+
+    def _hit(self, spr, i):
+        spr.collided_with(_shot_proxy)
+        # EnemyShot.collided_with
+        if self.delay[i] > 0:
+            return
+        if spr.type == EntityType.PLAYER and not spr.is_invincible():
+            self.remove[i] = True
+
+
+class EnemyShotView:
+    """One stage's shots in a `SharedEnemyShots`, with the interface of
+    `EnemyShotArrays`. Column attributes (`x`, `y`, `vx`, `vy`) are copies
+    of this env's rows, in order."""
+
+    def __init__(self, shared, env, game_state) -> None:
+        self.shared = shared
+        self.env = env
+        self.game_state = game_state
+        shared.clear_env(env)  # left over from the env's previous stage
+
+    def __len__(self):
+        return int(self.shared.counts[self.env])
+
+    def _active(self):
+        active = np.zeros(self.shared.num_envs, dtype=np.bool_)
+        active[self.env] = True
+        return active
+
+    def spawn(self, x, y, vx, vy, delay=0):
+        self.shared.spawn_env(self.env, x, y, vx, vy, delay)
+
+    def clear(self):
+        self.shared.clear_env(self.env)
+
+    def update(self):
+        frame_counts = np.zeros(self.shared.num_envs, dtype=np.int64)
+        frame_counts[self.env] = self.game_state.frame_count
+        self.shared.update_envs(self._active(), frame_counts,
+                                self.game_state.background)
+
+    def collide_sprite(self, spr):
+        if spr.remove or len(self) == 0:
+            return
+        players = [spr] * self.shared.num_envs
+        self.shared.collide_players(self._active(), players)
+
+    def _column(self, name):
+        return getattr(self.shared, name)[self.shared.indices(self.env)]
+
+    x = property(lambda self: self._column("x"))
+    y = property(lambda self: self._column("y"))
+    vx = property(lambda self: self._column("vx"))
+    vy = property(lambda self: self._column("vy"))
+
+    def draw(self):
+        shared = self.shared
+        for i in shared.indices(self.env):
+            if shared.delay[i] > 0:
+                continue
+            px.pal(15, int(shared.colour[i]))
+            px.blt(float(shared.x[i]), float(shared.y[i]), 0,
+                   U, V, SIZE, SIZE, 0)
+            px.pal()
+
+    def _sprite(self, i):
+        shared = self.shared
+        s = EnemyShot(self.game_state, float(shared.x[i]),
+                      float(shared.y[i]), float(shared.vx[i]),
+                      float(shared.vy[i]), int(shared.delay[i]))
+        s.colour = int(shared.colour[i])
+        s.remove = bool(shared.remove[i])
+        return s
+
+    def __iter__(self):
+        return (self._sprite(i) for i in self.shared.indices(self.env))
+
+    def __setitem__(self, index, sprites):
+        if index != slice(None):
+            raise IndexError("only shots[:] = sprites is supported")
+        shared = self.shared
+        self.clear()
+        for s in sprites:
+            self.spawn(s.x, s.y, s.vx, s.vy, s.delay)
+            shared.colour[shared.count - 1] = s.colour
+            shared.remove[shared.count - 1] = s.remove
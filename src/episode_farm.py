@@ -0,0 +1,212 @@
+"""Process pool of headless stages writing into shared-memory ring buffers.
+
+Game state is partly module/class global (the `Powerup` type cycle,
+`audio.last_sound_played`), so one process can only run one
+stage at a time without juggling it. Each worker process owns one
+`StageEnv` and writes every stepped frame into its own ring in a single
+`multiprocessing.shared_memory` block; the parent reads the rings in place
+instead of receiving pickled observations.
+"""
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import queue
+import random
+import time
+
+import numpy as np
+
+from const import StageNum
+from headless import StageEnv, NUM_ACTIONS
+from vec_env import OBS_SIZE, write_observation
+
+FULL_RING_SLEEP = 0.0005  # seconds
+
+
+class RingBuffers:
+    """NumPy views over one shared block: one ring of frames per worker.
+
+    Each ring has a single producer (its worker) and a single consumer (the
+    parent). `heads[w]` counts frames written, `tails[w]` frames consumed.
+    """
+
+    def __init__(self, buf, num_workers, capacity) -> None:
+        shapes = (
+            ("obs", np.float32, (num_workers, capacity, OBS_SIZE)),
+            ("actions", np.int32, (num_workers, capacity)),
+            ("rewards", np.float32, (num_workers, capacity)),
+            ("dones", np.uint8, (num_workers, capacity)),
+            ("heads", np.int64, (num_workers,)),
+            ("tails", np.int64, (num_workers,)),
+        )
+        offset = 0
+        for name, dtype, shape in shapes:
+            count = int(np.prod(shape))
+            offset = -(-offset // 8) * 8  # keep every view 8-byte aligned
+            view = np.ndarray(shape, dtype=dtype, buffer=buf, offset=offset)
+            setattr(self, name, view)
+            offset += count * np.dtype(dtype).itemsize
+
+    @staticmethod
+    def size(num_workers, capacity):
+        frame = OBS_SIZE * 4 + 4 + 4 + 1
+        return num_workers * (capacity * frame + 16) + 6 * 8
+
+
+def _worker_main(index, shm_name, num_workers, capacity, stage_num,
+                 max_steps, policy, seed, stop_event, results):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    ring = RingBuffers(shm.buf, num_workers, capacity)
+    try:
+        rng = random.Random(seed)
+        env = StageEnv(stage_num, max_steps=max_steps, seed=seed)
+        obs = np.zeros(OBS_SIZE, dtype=np.float32)
+        env.reset()
+        write_observation(env, obs)
+
+        head = 0
+        while not stop_event.is_set():
+            if head - ring.tails[index] >= capacity:
+                time.sleep(FULL_RING_SLEEP)
+                continue
+
+            if policy is None:
+                action = rng.randrange(NUM_ACTIONS)
+            else:
+                action = policy(obs)
+            env.step(action)
+
+            slot = head % capacity
+            row = ring.obs[index, slot]
+            write_observation(env, row)
+            ring.actions[index, slot] = action
+            ring.rewards[index, slot] = env.reward
+            ring.dones[index, slot] = env.done
+            obs[:] = row
+            head += 1
+            ring.heads[index] = head
+
+            if env.done:
+                results.put((index, env.game.game_vars.score, env.steps))
+                env.reset()
+                write_observation(env, obs)
+    finally:
+        # Views into the block must go before it can be closed.
+        ring = row = None
+        shm.close()
+
+
+class EpisodeFarm:
+    """Runs `num_workers` headless stages in subprocesses.
+
+    `policy(obs) -> action` must be picklable; it gets the float32 row of
+    the previous frame (layout in `vec_env`). Without one, workers play
+    random actions seeded from `seed`.
+    """
+
+    def __init__(self, num_workers, stage_num=StageNum.STAGE_1,
+                 capacity=4096, policy=None, max_steps=0, seed=0) -> None:
+        self.num_workers = num_workers
+        self.capacity = capacity
+        self.shm = shared_memory.SharedMemory(
+            create=True, size=RingBuffers.size(num_workers, capacity))
+        self.ring = RingBuffers(self.shm.buf, num_workers, capacity)
+        self.ring.heads[:] = 0
+        self.ring.tails[:] = 0
+
+        ctx = mp.get_context("spawn")
+        self.stop_event = ctx.Event()
+        self.results = ctx.Queue()
+        self.workers = [
+            ctx.Process(
+                target=_worker_main,
+                args=(i, self.shm.name, num_workers, capacity, int(stage_num),
+                      max_steps, policy, seed + i, self.stop_event,
+                      self.results),
+                daemon=True,
+            )
+            for i in range(num_workers)
+        ]
+
+    def start(self):
+        for w in self.workers:
+            w.start()
+
+    def collect(self):
+        """Consume every frame written so far.
+
+        Returns copies of (obs, actions, rewards, dones, worker_ids), ordered
+        by worker and then by frame.
+        """
+        ring = self.ring
+        capacity = self.capacity
+        parts = []
+        for w in range(self.num_workers):
+            tail = int(ring.tails[w])
+            head = int(ring.heads[w])
+            if head == tail:
+                continue
+            slots = np.arange(tail, head) % capacity
+            parts.append((
+                ring.obs[w, slots],
+                ring.actions[w, slots],
+                ring.rewards[w, slots],
+                ring.dones[w, slots].astype(np.bool_),
+                np.full(head - tail, w, dtype=np.int32),
+            ))
+            ring.tails[w] = head
+
+        if not parts:
+            return (np.zeros((0, OBS_SIZE), dtype=np.float32),
+                    np.zeros(0, dtype=np.int32),
+                    np.zeros(0, dtype=np.float32),
+                    np.zeros(0, dtype=np.bool_),
+                    np.zeros(0, dtype=np.int32))
+        return tuple(np.concatenate(p) for p in zip(*parts))
+
+    def episode_results(self):
+        """Finished episodes since the last call: (worker, score, steps)."""
+        out = []
+        while True:
+            try:
+                out.append(self.results.get_nowait())
+            except queue.Empty:
+                return out
+
+    def close(self):
+        self.stop_event.set()
+        for w in self.workers:
+            w.join(timeout=5)
+            if w.is_alive():
+                w.terminate()
+        del self.ring
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Episode farm benchmark")
+    parser.add_argument("--workers", type=int, default=mp.cpu_count())
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--stage", type=int, default=int(StageNum.STAGE_1))
+    args = parser.parse_args()
+
+    frames = 0
+    episodes = 0
+    with EpisodeFarm(args.workers, args.stage) as farm:
+        start = time.perf_counter()
+        while time.perf_counter() - start < args.seconds:
+            time.sleep(0.05)
+            frames += len(farm.collect()[0])
+            episodes += len(farm.episode_results())
+        elapsed = time.perf_counter() - start
+    print(f"{args.workers} workers: {frames} frames, {episodes} episodes "
+          f"in {elapsed:.2f}s ({frames / elapsed:.0f} frames/s)")
@@ -9,6 +9,8 @@ MAX_FRAMES = len(FRAMES)
 FRAME_DELAY = 5
 
 class Explosion(Sprite):
+    __slots__ = ("delay", "frame", "frame_delay")
+
     def __init__(self, game_state, x, y, delay) -> None:
         super().__init__(game_state)
         self.x = x
@@ -3,10 +3,12 @@ import time
 from typing import Optional
 
 from game_state_titles import GameStateTitles
-from game_state_stage import GameStateStage
+from game_state_stage import GameStateStage, State
 from game_state_complete import GameStateComplete
 from game_vars import GameVars
 from game_data_collector import GameDataCollector
+from game_data_exporter import GameDataExporter
+from difficulty import DifficultyController
 
 
 class GameState(Enum):
@@ -22,23 +24,36 @@ class Game:
         self.next_state = None
         self.game_vars = GameVars(self)
         self.data_collector = GameDataCollector()
+        self.data_exporter = GameDataExporter(self.data_collector)
+        # 동적 난이도 조절: enable_adaptive_difficulty()로 켬
+        self.difficulty_controller = None
 
         self.state = GameStateTitles(self)
         # self.state = GameStateStage(self)
         # self.state = GameStateComplete(self)
 
+    def enable_adaptive_difficulty(self, on=True):
+        self.difficulty_controller = \
+            DifficultyController(self.game_vars.difficulty) if on else None
+
     def go_to_titles(self):
         self.next_state = GameState.TITLES
 
     def go_to_new_game(self):
         self.game_vars.new_game()
+        if self.difficulty_controller is not None:
+            self.difficulty_controller.reset()
         self.data_collector.clear()
         self.data_collector.start_recording(time.time())
+        self.data_exporter.begin()
         self.next_state = GameState.STAGE
     
     def go_to_continue(self):
         self.game_vars.continue_game()
+        if self.difficulty_controller is not None:
+            self.difficulty_controller.reset()
         self.data_collector.start_recording(time.time())
+        self.data_exporter.begin()
         self.next_state = GameState.STAGE
 
     def go_to_game_complete(self):
@@ -68,7 +83,15 @@ class Game:
     def update(self):
         if self.next_state is not None:
             self.switch_state()
-        self.state.update()
+        state = self.state
+        # 플레이 중인 프레임만 난이도 조절에 반영 (일시정지/사망/클리어 제외)
+        playing = isinstance(state, GameStateStage) and \
+            state.state == State.PLAY
+        state.update()
+        if playing and self.difficulty_controller is not None:
+            self.difficulty_controller.update(state)
+        if self.data_collector.is_recording:
+            self.data_exporter.update()
 
     def draw(self):
         self.state.draw()
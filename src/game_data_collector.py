@@ -1,13 +1,26 @@
 """게임 플레이 데이터 수집기"""
 import json
-from typing import List, Dict, Any
+from array import array
+from typing import List, Dict, Any, Optional
+
+from input import UP, DOWN, LEFT, RIGHT, BUTTON_1, BUTTON_2
+
+# 프레임 입력 비트 (비트 위치 = input 모듈의 버튼 인덱스)
+INPUT_FIELDS = (
+    ("input_left", LEFT),
+    ("input_right", RIGHT),
+    ("input_up", UP),
+    ("input_down", DOWN),
+    ("input_button1", BUTTON_1),
+    ("input_button2", BUTTON_2),
+)
 
 
 class GameDataCollector:
     """게임 플레이 데이터를 수집하고 저장하는 클래스"""
     
     def __init__(self):
-        self.frames_data: List[Dict[str, Any]] = []
+        self._reset_frames()
         self.start_time = 0.0
         self.end_time = 0.0
         self.is_recording = False
@@ -27,7 +40,7 @@ class GameDataCollector:
         """녹화 시작"""
         self.is_recording = True
         self.start_time = start_time
-        self.frames_data = []
+        self._reset_frames()
         self.total_frames = 0
         self.enemies_destroyed = 0
         self.shots_fired = 0
@@ -41,13 +54,56 @@ class GameDataCollector:
         self.is_recording = False
         self.end_time = end_time
         
-    def record_frame(self, frame_data: Dict[str, Any]):
-        """프레임 데이터 기록"""
+    def _reset_frames(self):
+        """프레임 컬럼 버퍼 초기화 (필드별 배열, 프레임당 32바이트)"""
+        self.frame_player_x = array("d")
+        self.frame_player_y = array("d")
+        self.frame_lives = array("B")
+        self.frame_score = array("I")
+        self.frame_weapon = array("B")
+        self.frame_inputs = array("B")
+        self.frame_stage = array("B")
+        self.frame_timestamp = array("d")
+
+    def record_frame(self, player_x: float, player_y: float, lives: int,
+                     score: int, weapon: int, inputs: int, stage_num: int,
+                     timestamp: float):
+        """프레임 데이터 기록 (inputs: 버튼 인덱스별 비트)"""
         if not self.is_recording:
             return
-            
-        self.frames_data.append(frame_data)
+
+        self.frame_player_x.append(player_x)
+        self.frame_player_y.append(player_y)
+        self.frame_lives.append(lives)
+        self.frame_score.append(score)
+        self.frame_weapon.append(weapon)
+        self.frame_inputs.append(inputs)
+        self.frame_stage.append(stage_num)
+        self.frame_timestamp.append(timestamp)
         self.total_frames += 1
+
+    def export_frames(self, start: int = 0,
+                      end: Optional[int] = None) -> List[Dict[str, Any]]:
+        """컬럼 버퍼를 프레임 딕셔너리 목록으로 변환 ([start, end) 구간)"""
+        if end is None:
+            end = len(self.frame_inputs)
+        frames = []
+        for i in range(start, end):
+            inputs = self.frame_inputs[i]
+            frame = {
+                "frame_number": i,
+                "player_x": self.frame_player_x[i],
+                "player_y": self.frame_player_y[i],
+                "player_lives": self.frame_lives[i],
+                "player_score": self.frame_score[i],
+                "current_weapon": self.frame_weapon[i],
+            }
+            for name, bit in INPUT_FIELDS:
+                frame[name] = (inputs >> bit) & 1
+            frame["stage_num"] = self.frame_stage[i]
+            frame["timestamp"] = self.frame_timestamp[i]
+            frames.append(frame)
+        return frames
         
     def add_enemy_destroyed(self):
         """적 파괴 카운트 증가"""
@@ -125,10 +181,47 @@ class GameDataCollector:
             "score": score,
             "final_stage": final_stage,
             "statistics": self.get_statistics(),
-            "frames": self.frames_data,
+            "frames": self.export_frames(),
             "enemy_events": self.enemy_events,
         }
         
+    def export_compact_frames(self, start: int = 0,
+                              end: Optional[int] = None,
+                              keyframe_interval: int = 300) -> Dict[str, Any]:
+        """[start, end) 구간을 압축 프레임 블록으로 변환
+        (replay_codec.decode_frames로 복원)"""
+        import replay_codec
+
+        if end is None:
+            end = len(self.frame_inputs)
+        return replay_codec.encode_columns(
+            self.frame_player_x[start:end],
+            self.frame_player_y[start:end],
+            self.frame_lives[start:end],
+            self.frame_score[start:end],
+            self.frame_weapon[start:end],
+            self.frame_inputs[start:end],
+            self.frame_stage[start:end],
+            self.frame_timestamp[start:end],
+            keyframe_interval,
+        )
+
+    def export_compact_data(self, score: int, final_stage: int,
+                            keyframe_interval: int = 300) -> Dict[str, Any]:
+        """프레임을 압축 리플레이 형식으로 내보내기 (replay_codec.decode로 복원)"""
+        import replay_codec
+
+        return {
+            "score": score,
+            "final_stage": final_stage,
+            "statistics": self.get_statistics(),
+            "frames": self.export_compact_frames(
+                keyframe_interval=keyframe_interval),
+            "enemy_events": self.enemy_events,
+            "format": replay_codec.FORMAT_NAME,
+            "version": replay_codec.FORMAT_VERSION,
+        }
+
     def export_json(self, score: int, final_stage: int) -> str:
         """JSON 형식으로 내보내기"""
         data = self.export_data(score, final_stage)
@@ -136,7 +229,7 @@ class GameDataCollector:
         
     def clear(self):
         """데이터 초기화"""
-        self.frames_data = []
+        self._reset_frames()
         self.total_frames = 0
         self.enemies_destroyed = 0
         self.shots_fired = 0
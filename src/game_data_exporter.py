@@ -0,0 +1,139 @@
+"""게임 데이터 청크 단위 내보내기
+
+청크는 replay_codec의 압축 프레임 블록(encode_columns)이다. 각 청크는 첫
+프레임이 키프레임이라 따로 복원할 수 있고, 매니페스트의 total_frames로
+누락된 청크를 확인한다.
+"""
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, List
+
+import replay_codec
+
+CHUNK_FRAMES = 600  # 청크당 프레임 수 (60 FPS 기준 10초)
+DATA_KEY = "pyxelGameData"  # 매니페스트 (청크 목록 + 통계)
+CHUNK_KEY_PREFIX = "pyxelGameDataChunk"  # + 청크 번호
+EXPORT_DIR = "models"
+
+
+class GameDataExporter:
+    """녹화 중인 프레임을 고정 크기 청크로 나누어 내보내는 클래스
+
+    웹에서는 localStorage의 번호 붙은 키에, 로컬 실행에서는 세션 디렉토리의
+    파일에 청크를 기록한다. 게임 종료 시에는 마지막 청크와 작은 매니페스트만
+    기록한다.
+    """
+
+    def __init__(self, collector, chunk_frames: int = CHUNK_FRAMES):
+        self.collector = collector
+        self.chunk_frames = chunk_frames
+        self.flushed_frames = 0
+        self.chunk_keys: List[str] = []
+        self.session_dir = None
+
+        try:
+            import js
+            self.js = js
+        except ImportError:
+            self.js = None
+
+    def begin(self):
+        """새 녹화 시작: 이전 세션의 청크 정리"""
+        if self.js is not None:
+            storage = self.js.localStorage
+            i = 0
+            while storage.getItem(f"{CHUNK_KEY_PREFIX}{i}") is not None:
+                storage.removeItem(f"{CHUNK_KEY_PREFIX}{i}")
+                i += 1
+        self.flushed_frames = 0
+        self.chunk_keys = []
+        self.session_dir = None
+
+    def update(self):
+        """청크 크기만큼 프레임이 쌓이면 내보내기 (매 프레임 호출)"""
+        if self.collector.total_frames - self.flushed_frames >= \
+                self.chunk_frames:
+            self._write_chunk(self.flushed_frames + self.chunk_frames)
+
+    def _write_chunk(self, end: int):
+        block = self.collector.export_compact_frames(self.flushed_frames, end)
+        block_json = json.dumps(block, separators=(",", ":"))
+        index = len(self.chunk_keys)
+        if self.js is not None:
+            key = f"{CHUNK_KEY_PREFIX}{index}"
+            self.js.localStorage.setItem(key, block_json)
+        else:
+            key = f"chunk_{index:04}.json"
+            with open(os.path.join(self._get_session_dir(), key), "w",
+                      encoding="utf-8") as f:
+                f.write(block_json)
+        self.chunk_keys.append(key)
+        self.flushed_frames = end
+
+    def _get_session_dir(self) -> str:
+        if self.session_dir is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            self.session_dir = os.path.join(EXPORT_DIR,
+                                            f"game_data_{timestamp}")
+            os.makedirs(self.session_dir, exist_ok=True)
+        return self.session_dir
+
+    def finalize(self, score: int, final_stage: int) -> Dict[str, Any]:
+        """남은 프레임을 내보내고 매니페스트 기록"""
+        if self.collector.total_frames > self.flushed_frames:
+            self._write_chunk(self.collector.total_frames)
+
+        manifest = {
+            "score": score,
+            "final_stage": final_stage,
+            "statistics": self.collector.get_statistics(),
+            "enemy_events": self.collector.enemy_events,
+            "total_frames": self.flushed_frames,
+            "chunk_frames": self.chunk_frames,
+            "chunk_keys": self.chunk_keys,
+            "format": replay_codec.FORMAT_NAME,
+            "version": replay_codec.FORMAT_VERSION,
+        }
+
+        if self.js is not None:
+            js = self.js
+            manifest_json = json.dumps(manifest)
+            js.console.log(f"Game data: score={score}, stage={final_stage}, "
+                           f"frames={self.flushed_frames}, "
+                           f"chunks={len(self.chunk_keys)}")
+            js.console.log(f"Manifest size: {len(manifest_json)} bytes")
+
+            js.localStorage.setItem(DATA_KEY, manifest_json)
+            js.localStorage.setItem("pyxelGameCompleted", "true")
+            js.localStorage.setItem("pyxelGameTimestamp", str(js.Date.now()))
+            js.console.log("✓ Game data manifest saved to localStorage")
+        else:
+            path = os.path.join(self._get_session_dir(), "manifest.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=2, ensure_ascii=False)
+            print(f"✓ 게임 데이터 저장: {self.session_dir} "
+                  f"(프레임 {self.flushed_frames}, 청크 {len(self.chunk_keys)})")
+
+        return manifest
+
+
+def load_manifest_dir(path: str) -> Dict[str, Any]:
+    """로컬 세션 디렉토리를 export_data() 형식으로 다시 합치기"""
+    with open(os.path.join(path, "manifest.json"), encoding="utf-8") as f:
+        manifest = json.load(f)
+    frames = []
+    for key in manifest["chunk_keys"]:
+        with open(os.path.join(path, key), encoding="utf-8") as f:
+            frames.extend(replay_codec.decode_frames(json.load(f),
+                                                     len(frames)))
+    if len(frames) != manifest["total_frames"]:
+        raise ValueError(f"{path}: {len(frames)} frames in chunks, "
+                         f"manifest says {manifest['total_frames']}")
+    return {
+        "score": manifest["score"],
+        "final_stage": manifest["final_stage"],
+        "statistics": manifest["statistics"],
+        "frames": frames,
+        "enemy_events": manifest["enemy_events"],
+    }
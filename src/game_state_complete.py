@@ -37,69 +37,24 @@ class GameStateComplete:
     def _export_game_data(self):
         """게임 데이터를 JavaScript로 전달"""
         try:
-            # JavaScript로 데이터 전달 (Pyxel 웹 환경)
-            try:
-                import js
-                
-                js.console.log("=== Starting game completion data export ===")
-                
-                # 데이터 수집
-                game_data = self.game.data_collector.export_data(
-                    score=self.game.game_vars.score,
-                    final_stage=self.game.game_vars.stage_num,
-                )
-                
-                js.console.log(f"Game data collected: score={game_data['score']}, stage={game_data['final_stage']}")
-                js.console.log(f"Frames: {len(game_data['frames'])}, Enemy events: {len(game_data['enemy_events'])}")
-
-                # JSON 문자열로 변환
-                json_data = json.dumps(game_data)
-                js.console.log(f"JSON data size: {len(json_data)} bytes")
-
-                # localStorage에 게임 데이터 저장
-                js.localStorage.setItem("pyxelGameData", json_data)
-                js.console.log("✓ pyxelGameData saved")
-                
-                js.localStorage.setItem("pyxelGameCompleted", "true")
-                js.console.log("✓ pyxelGameCompleted saved")
-                
-                js.localStorage.setItem("pyxelGameTimestamp", str(js.Date.now()))
-                js.console.log("✓ pyxelGameTimestamp saved")
-
-                js.console.log("=== Game completed - All data saved to localStorage ===")
-                
-            except ImportError:
-                # 로컬 실행 환경에서는 파일로 저장
+            # 남은 프레임 청크와 매니페스트 기록 (웹: localStorage, 로컬: models/)
+            exporter = self.game.data_exporter
+            manifest = exporter.finalize(
+                score=self.game.game_vars.score,
+                final_stage=self.game.game_vars.stage_num,
+            )
+            print("Game completed!")
+            print(f"Score: {manifest['score']}")
+            print(f"Statistics: {manifest['statistics']}")
+            print(f"Frames: {manifest['total_frames']}, Enemy events: {len(manifest['enemy_events'])}")
+
+            if exporter.js is None:
                 import os
-                from datetime import datetime
-                
-                print("Game completed!")
-                game_data = self.game.data_collector.export_data(
-                    score=self.game.game_vars.score,
-                    final_stage=self.game.game_vars.stage_num,
-                )
-                print(f"Score: {self.game.game_vars.score}")
-                print(f"Statistics: {game_data['statistics']}")
-                print(f"Frames: {len(game_data['frames'])}, Enemy events: {len(game_data['enemy_events'])}")
-                
-                # models 디렉토리 확인 및 생성
-                models_dir = "models"
-                if not os.path.exists(models_dir):
-                    os.makedirs(models_dir)
-                
-                # 타임스탬프 생성
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                
-                # 전체 게임 데이터 저장
-                full_data_filename = os.path.join(models_dir, f"game_data_{timestamp}.json")
-                with open(full_data_filename, 'w', encoding='utf-8') as f:
-                    json.dump(game_data, f, indent=2, ensure_ascii=False)
-                print(f"✓ 전체 게임 데이터 저장: {full_data_filename}")
-                
+
                 # 적 이벤트만 저장 (enemy_pattern_template.json 형식)
-                enemy_events_filename = os.path.join(models_dir, f"enemy_pattern_{timestamp}.json")
+                enemy_events_filename = os.path.join(exporter.session_dir, "enemy_pattern.json")
                 with open(enemy_events_filename, 'w', encoding='utf-8') as f:
-                    json.dump(game_data['enemy_events'], f, indent=2, ensure_ascii=False)
+                    json.dump(manifest['enemy_events'], f, indent=2, ensure_ascii=False)
                 print(f"✓ 적 이벤트 데이터 저장: {enemy_events_filename}")
 
         except Exception as e:
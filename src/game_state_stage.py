@@ -1,7 +1,5 @@
 from enum import Enum, auto
 
-import pyxel as px
-
 from const import (
     FINAL_STAGE,
     STAGE_MUSIC_FILES,
@@ -11,15 +9,19 @@ from const import (
 )
 from player import Player
 from sprite import (
-    sprites_update,
-    sprites_draw,
+    SpriteList,
     sprite_lists_collide,
     sprite_collide_list,
 )
 from hud import Hud
 from explosion import Explosion
+from player_shot import PlayerShot
+from enemy_shot import EnemyShot
+from sprite_pool import SpritePool
 from powerup import Powerup
 from stage_background import StageBackground
+from sim_random import SimRandom, stage_seed
+import stage_snapshot
 import input
 from audio import load_music, play_music, is_music_playing, stop_music
 
@@ -34,11 +36,15 @@ class State(Enum):
 
 
 PLAYER_SPAWN_IN_FRAMES = 30
+# 풀 크기 (동시에 존재하는 최대 개수 기준)
+PLAYER_SHOT_POOL_SIZE = 8
+ENEMY_SHOT_POOL_SIZE = 128
+EXPLOSION_POOL_SIZE = 64
 STAGE_CLEAR_FRAMES = 180
 
 
 class GameStateStage:
-    def __init__(self, game) -> None:
+    def __init__(self, game, batched_shots=False) -> None:
         self.game = game
         
         # 리플레이 모드인 경우에도 등장 연출(자동 이동)을 수행하여 초기 상태를 맞춤
@@ -49,18 +55,42 @@ class GameStateStage:
         self.font = game.app.main_font
 
         self.state_time = 0
+
+        # 난이도 파라미터 (difficulty.py) 와 조절용 카운터
+        self.difficulty = game.game_vars.difficulty
+        self.hits_taken = 0
+        self.kills = 0
+        self.deaths = 0
+
+        # 시뮬레이션 시계와 난수 (px.frame_count / px.rndi 대신 사용)
+        self.frame_count = 0
+        self.rng = SimRandom(
+            stage_seed(game.game_vars.seed, game.game_vars.stage_num))
         
         self.player = Player(self)
         
-        self.player_shots = []
-
-        self.enemies = []
-        self.enemy_shots = []
-        self.bosses = []
+        self.player_shot_pool = SpritePool(PlayerShot, PLAYER_SHOT_POOL_SIZE)
+        self.enemy_shot_pool = SpritePool(EnemyShot, ENEMY_SHOT_POOL_SIZE)
+        self.explosion_pool = SpritePool(Explosion, EXPLOSION_POOL_SIZE)
+
+        self.player_shots = SpriteList()
+
+        self.enemies = SpriteList()
+        # batched_shots: 적 탄을 NumPy 배열로 일괄 처리 (enemy_shot_arrays)
+        # 함수를 주면 그 함수가 만든 컨테이너를 쓴다 (vec_env 의 공유 배열)
+        self.batched_shots = bool(batched_shots)
+        if callable(batched_shots):
+            self.enemy_shots = batched_shots(self)
+        elif batched_shots:
+            from enemy_shot_arrays import EnemyShotArrays
+            self.enemy_shots = EnemyShotArrays(self)
+        else:
+            self.enemy_shots = SpriteList()
+        self.bosses = SpriteList()
 
-        self.explosions = []
+        self.explosions = SpriteList()
 
-        self.powerups = []
+        self.powerups = SpriteList()
         Powerup.reset_cycle()
 
         self.background = StageBackground(
@@ -78,14 +108,37 @@ class GameStateStage:
         play_music(self.music, num_channels=3)
 
     def on_exit(self):
-        px.stop()
+        stop_music()
+
+    def snapshot(self):
+        """현재 스테이지 상태 스냅샷 (stage_snapshot 참고)"""
+        return stage_snapshot.take(self)
+
+    def restore(self, snap):
+        """snapshot()으로 저장한 상태로 되돌리기"""
+        self.player_shot_pool.recycle(self.player_shots)
+        self.clear_enemy_shots()
+        self.explosion_pool.recycle(self.explosions)
+        stage_snapshot.restore(self, snap)
+        self.player_shot_pool.reset_live(len(self.player_shots))
+        if not self.batched_shots:
+            self.enemy_shot_pool.reset_live(len(self.enemy_shots))
+        self.explosion_pool.reset_live(len(self.explosions))
+
+    def pool_stats(self):
+        """샷/폭발 풀 사용량 (high_water: 최대 동시 사용 수)"""
+        return {
+            "player_shots": self.player_shot_pool.stats(),
+            "enemy_shots": self.enemy_shot_pool.stats(),
+            "explosions": self.explosion_pool.stats(),
+        }
 
     def end_of_vortex_stage(self):
         if self.state == State.PLAY:
             self.check_stage_clear = True
 
     def stage_clear_init(self):
-        self.enemy_shots.clear()
+        self.clear_enemy_shots()
         for e in self.enemies:
             e.destroy()
         self.switch_state(State.STAGE_CLEAR)
@@ -103,20 +156,23 @@ class GameStateStage:
         return self.background.scroll_x_speed
 
     def add_enemy(self, e):
+        e.hp = self.difficulty.scale_hp(e.hp)
         self.enemies.append(e)
         # print(f"Added enemy type {e.type} at {e.x//8},{e.y//8}")
 
     def add_boss(self, b):
+        b.hp = self.difficulty.scale_hp(b.hp)
         self.bosses.append(b)
 
     def add_powerup(self, p):
         self.powerups.append(p)
 
     def add_explosion(self, x, y, delay):
-        self.explosions.append(Explosion(self, x, y, delay))
+        self.explosions.append(
+            self.explosion_pool.acquire(self, x, y, delay))
 
     def trigger_bomb(self):
-        self.enemy_shots.clear()
+        self.clear_enemy_shots()
         for e in self.enemies:
             e.hit_with_bomb()
         for b in self.bosses:
@@ -135,6 +191,19 @@ class GameStateStage:
     def add_enemy_shot(self, s):
         self.enemy_shots.append(s)
 
+    def spawn_enemy_shot(self, x, y, vx, vy, delay=0):
+        if self.batched_shots:
+            self.enemy_shots.spawn(x, y, vx, vy, delay)
+        else:
+            self.add_enemy_shot(
+                self.enemy_shot_pool.acquire(self, x, y, vx, vy, delay))
+
+    def clear_enemy_shots(self):
+        if self.batched_shots:
+            self.enemy_shots.clear()
+        else:
+            self.enemy_shot_pool.recycle(self.enemy_shots)
+
     def update_play(self):
         # 항상 프레임 데이터 기록 (리플레이 모드 포함 - 실행 데이터 수집)
         # Player Update 전에 기록하여 (현재 상태 + 현재 입력) 조합을 저장
@@ -146,23 +215,17 @@ class GameStateStage:
     def _record_frame_data(self):
         """현재 프레임의 게임 데이터를 기록"""
         try:
-            frame_data = {
-                "frame_number": self.game.data_collector.total_frames,
-                "player_x": float(self.player.x),
-                "player_y": float(self.player.y),
-                "player_lives": self.game.game_vars.lives,
-                "player_score": self.game.game_vars.score,
-                "current_weapon": self.game.game_vars.current_weapon,
-                "input_left": 1 if self.input.is_pressing(input.LEFT) else 0,
-                "input_right": 1 if self.input.is_pressing(input.RIGHT) else 0,
-                "input_up": 1 if self.input.is_pressing(input.UP) else 0,
-                "input_down": 1 if self.input.is_pressing(input.DOWN) else 0,
-                "input_button1": 1 if self.input.is_pressing(input.BUTTON_1) else 0,
-                "input_button2": 1 if self.input.is_pressing(input.BUTTON_2) else 0,
-                "stage_num": self.game.game_vars.stage_num,
-                "timestamp": float(self.state_time) / 30.0,  # 30 FPS 기준
-            }
-            self.game.data_collector.record_frame(frame_data)
+            game_vars = self.game.game_vars
+            self.game.data_collector.record_frame(
+                float(self.player.x),
+                float(self.player.y),
+                game_vars.lives,
+                game_vars.score,
+                game_vars.current_weapon,
+                self.input.get_pressing_bits(),
+                game_vars.stage_num,
+                float(self.state_time) / 30.0,  # 30 FPS 기준
+            )
         except Exception as e:
             # 데이터 수집 실패해도 게임은 계속 진행
             pass
@@ -205,51 +268,14 @@ class GameStateStage:
     def _export_game_over_data(self):
         """게임 오버 시 게임 데이터를 JavaScript로 전달"""
         try:
-            import json
-            
-            # 게임 데이터 수집
-            game_data = self.game.data_collector.export_data(
+            # 남은 프레임 청크와 매니페스트 기록 (웹: localStorage, 로컬: models/)
+            manifest = self.game.data_exporter.finalize(
                 score=self.game.game_vars.score,
                 final_stage=self.game.game_vars.stage_num,
             )
-            
-            # 메타데이터 초기화
-            if "metadata" not in game_data:
-                game_data["metadata"] = {}
-            
-            json_data = json.dumps(game_data)
-
-            # JavaScript로 데이터 전달 (Pyxel 웹 환경)
-            try:
-                import js
-                
-                js.console.log("=== Starting game data export ===")
-                
-                js.console.log(f"Game data collected: score={game_data['score']}, stage={game_data['final_stage']}")
-                js.console.log(f"Frames: {len(game_data['frames'])}, Enemy events: {len(game_data['enemy_events'])}")
-                js.console.log(f"JSON data size: {len(json_data)} bytes")
-
-                # localStorage에 게임 데이터 저장
-                js.localStorage.setItem("pyxelGameData", json_data)
-                js.console.log("✓ pyxelGameData saved")
-                
-                js.localStorage.setItem("pyxelGameCompleted", "true")
-                js.console.log("✓ pyxelGameCompleted saved")
-                
-                js.localStorage.setItem("pyxelGameTimestamp", str(js.Date.now()))
-                js.console.log("✓ pyxelGameTimestamp saved")
-
-                js.console.log("=== Game Over - All data saved to localStorage ===")
-                
-            except ImportError:
-                # 로컬 실행 환경
-                print("Game Over!")
-                print(f"Final Score: {self.game.game_vars.score}")
-                game_data = self.game.data_collector.export_data(
-                    score=self.game.game_vars.score,
-                    final_stage=self.game.game_vars.stage_num,
-                )
-                print(f"Frames: {len(game_data['frames'])}, Enemy events: {len(game_data['enemy_events'])}")
+            print("Game Over!")
+            print(f"Final Score: {manifest['score']}")
+            print(f"Frames: {manifest['total_frames']}, Enemy events: {len(manifest['enemy_events'])}")
 
         except Exception as e:
             try:
@@ -270,6 +296,19 @@ class GameStateStage:
             self.game.go_to_next_stage()
 
     def update(self):
+        if not self.update_world():
+            return
+        self.update_enemy_shots()
+        self.collide_world()
+        self.collide_enemy_shots()
+        self.update_end()
+
+    # update() 를 단계별로 나눈 것: vec_env 는 적 탄 단계를 여러 스테이지에
+    # 대해 한 번에 돌리고 나머지는 스테이지별로 이 순서대로 호출한다
+    def update_world(self):
+        """시계, 상태 머신, 배경과 적 탄 이외 스프라이트 업데이트.
+        이번 프레임을 여기서 멈추면 False."""
+        self.frame_count += 1
         self.state_time += 1
 
         if self.state == State.PLAYER_SPAWNED:
@@ -277,7 +316,7 @@ class GameStateStage:
         elif self.state == State.PLAY:
             if self.input.has_tapped(input.BUTTON_2):
                 self.switch_state(State.PAUSED)
-                return
+                return False
             self.update_play()
         elif self.state == State.PLAYER_DEAD:
             self.update_player_dead()
@@ -285,22 +324,29 @@ class GameStateStage:
             if self.input.has_tapped(input.BUTTON_2):
                 self.switch_state(State.PLAY)
             else:
-                return
+                return False
         elif self.state == State.GAME_OVER:
             self.update_game_over()
-            return
+            return False
         elif self.state == State.STAGE_CLEAR:
             self.update_stage_clear()
 
         # 배경 업데이트 (적 생성 로직은 background 내부에서 리플레이 모드 체크로 방지됨)
         self.background.update()
 
-        sprites_update(self.powerups)
-        sprites_update(self.player_shots)
-        sprites_update(self.enemies)
-        sprites_update(self.bosses)
-        sprites_update(self.enemy_shots)
+        self.powerups.update()
+        self.player_shots.update(self.player_shot_pool)
+        self.enemies.update()
+        self.bosses.update()
+        return True
 
+    def update_enemy_shots(self):
+        if self.batched_shots:
+            self.enemy_shots.update()
+        else:
+            self.enemy_shots.update(self.enemy_shot_pool)
+
+    def collide_world(self):
         if self.check_stage_clear:
             self.check_stage_clear = False
             if len(self.bosses) == 0:
@@ -309,15 +355,22 @@ class GameStateStage:
         sprite_lists_collide(self.player_shots, self.enemies)
         sprite_lists_collide(self.player_shots, self.bosses)
         sprite_collide_list(self.player, self.powerups)
-        sprite_collide_list(self.player, self.enemy_shots)
+
+    def collide_enemy_shots(self):
+        if self.batched_shots:
+            self.enemy_shots.collide_sprite(self.player)
+        else:
+            sprite_collide_list(self.player, self.enemy_shots)
+
+    def update_end(self):
         sprite_collide_list(self.player, self.enemies)
         sprite_collide_list(self.player, self.bosses)
 
-        sprites_update(self.explosions)
+        self.explosions.update(self.explosion_pool)
 
         if self.state == State.PLAY and self.player.remove:
             self.switch_state(State.PLAYER_DEAD)
-            self.player_shots.clear()
+            self.player_shot_pool.recycle(self.player_shots)
 
     def draw(self):
         self.background.draw()
@@ -325,12 +378,12 @@ class GameStateStage:
         if self.state != State.PLAYER_DEAD and self.state != State.GAME_OVER:
             self.player.draw()
 
-        sprites_draw(self.powerups)
-        sprites_draw(self.player_shots)
-        sprites_draw(self.enemies)
-        sprites_draw(self.bosses)
-        sprites_draw(self.explosions)
-        sprites_draw(self.enemy_shots)
+        self.powerups.draw()
+        self.player_shots.draw()
+        self.enemies.draw()
+        self.bosses.draw()
+        self.explosions.draw()
+        self.enemy_shots.draw()
 
         self.hud.draw()
 
@@ -1,6 +1,7 @@
 
 from const import STARTING_LIVES, MAX_WEAPONS, MAX_SCORE, MAX_WEAPON_LEVEL,\
     MAX_LIVES, StageNum, FINAL_STAGE
+from difficulty import Difficulty
 
 class GameVars:
     def __init__(self, game):
@@ -13,6 +14,10 @@ class GameVars:
         for _ in range(MAX_WEAPONS):
             self.weapon_levels.append(0)
         self.stage_num = StageNum.STAGE_1
+        # Seeds each stage's SimRandom; see GameStateStage.
+        self.seed = 0
+        # Read by the stage every frame; see difficulty.py.
+        self.difficulty = Difficulty()
 
     def is_vortex_stage(self):
         return self.stage_num % 2 == 0
@@ -0,0 +1,172 @@
+"""Occupancy grid observations of a `GameStateStage`, without rendering.
+
+The play area (the screen between the HUD bars) is divided into
+`cols` x `rows` cells, 32 x 20 by default (8 pixel cells), and every channel
+is a uint8 layer, 1 where something of that kind overlaps the cell:
+
+    SOLID        background tiles the simulation collides with
+    PLAYER
+    ENEMIES
+    BOSSES
+    ENEMY_SHOTS
+    PLAYER_SHOTS
+    POWERUPS
+
+Sprite rects are gathered into reused coordinate arrays and written with a
+few fancy-index assignments per channel. Background collision looks the
+map up at screen coordinates (`StageBackground.is_point_colliding`), so
+SOLID shows those tiles rather than the scrolled ones being drawn.
+"""
+import numpy as np
+
+from enemy_shot import SIZE as SHOT_SIZE
+from solid_tile_map import TILE_SIZE
+from stage_background import VIEW_WIDTH, VIEW_HEIGHT
+
+PLAY_AREA_Y = 16
+
+SOLID = 0
+PLAYER = 1
+ENEMIES = 2
+BOSSES = 3
+ENEMY_SHOTS = 4
+PLAYER_SHOTS = 5
+POWERUPS = 6
+NUM_CHANNELS = 7
+
+# channel -> stage sprite list
+SPRITE_CHANNELS = (
+    (ENEMIES, "enemies"),
+    (BOSSES, "bosses"),
+    (ENEMY_SHOTS, "enemy_shots"),
+    (PLAYER_SHOTS, "player_shots"),
+    (POWERUPS, "powerups"),
+)
+
+DEFAULT_COLS = VIEW_WIDTH // TILE_SIZE
+DEFAULT_ROWS = VIEW_HEIGHT // TILE_SIZE
+
+
+class GridEncoder:
+    def __init__(self, cols=DEFAULT_COLS, rows=DEFAULT_ROWS) -> None:
+        self.cols = cols
+        self.rows = rows
+        self.cell_w = VIEW_WIDTH / cols
+        self.cell_h = VIEW_HEIGHT / rows
+        self.shape = (NUM_CHANNELS, rows, cols)
+        self.dtype = np.uint8
+        self.grid = np.zeros(self.shape, dtype=self.dtype)
+        self._diff = np.zeros((rows + 1, cols + 1), dtype=np.int32)
+
+        # (solid tile map, its cell layer) of the last stage seen
+        self._solid_key = None
+        self._solid = None
+
+        self._alloc(64)
+
+    def _alloc(self, capacity):
+        self.capacity = capacity
+        self._x = np.zeros(capacity, dtype=np.float64)
+        self._y = np.zeros(capacity, dtype=np.float64)
+        self._w = np.zeros(capacity, dtype=np.float64)
+        self._h = np.zeros(capacity, dtype=np.float64)
+
+    def _solid_cells(self, solid_tiles):
+        """Cells touching a solid tile of the on-screen part of the map."""
+        if self._solid_key is not solid_tiles:
+            tiles = np.zeros((VIEW_HEIGHT // TILE_SIZE,
+                              VIEW_WIDTH // TILE_SIZE), dtype=np.uint8)
+            view = solid_tiles.as_array()[:tiles.shape[0], :tiles.shape[1]]
+            tiles[:view.shape[0], :view.shape[1]] = view
+
+            # tiles overlapped by each cell, counted with a summed-area table
+            table = np.zeros((tiles.shape[0] + 1, tiles.shape[1] + 1),
+                             dtype=np.int32)
+            table[1:, 1:] = tiles.cumsum(axis=0).cumsum(axis=1)
+            ty0, ty1 = self._cell_tiles(self.rows, self.cell_h, tiles.shape[0])
+            tx0, tx1 = self._cell_tiles(self.cols, self.cell_w, tiles.shape[1])
+            count = table[np.ix_(ty1, tx1)] - table[np.ix_(ty0, tx1)] \
+                - table[np.ix_(ty1, tx0)] + table[np.ix_(ty0, tx0)]
+            self._solid = (count > 0).astype(np.uint8)
+            self._solid_key = solid_tiles
+        return self._solid
+
+    @staticmethod
+    def _cell_tiles(n, cell_size, num_tiles):
+        """First tile and one past the last tile of each of `n` cells."""
+        start = np.arange(n) * cell_size
+        first = (start // TILE_SIZE).astype(np.intp)
+        last = np.ceil((start + cell_size) / TILE_SIZE).astype(np.intp)
+        return first, np.minimum(last, num_tiles)
+
+    def _gather(self, sprites):
+        """Copy sprite rects into the coordinate arrays; returns the count."""
+        n = len(sprites)
+        if n > self.capacity:
+            self._alloc(max(n, self.capacity * 2))
+        if hasattr(sprites, "vx"):
+            # EnemyShotArrays
+            self._x[:n] = sprites.x[:n]
+            self._y[:n] = sprites.y[:n]
+            self._w[:n] = SHOT_SIZE
+            self._h[:n] = SHOT_SIZE
+            return n
+        x, y, w, h = self._x, self._y, self._w, self._h
+        for i, s in enumerate(sprites):
+            x[i] = s.x
+            y[i] = s.y
+            w[i] = s.w
+            h[i] = s.h
+        return n
+
+    def _fill(self, layer, n):
+        """Mark the cells overlapped by the first `n` gathered rects."""
+        if n == 0:
+            return
+        x = self._x[:n]
+        y = self._y[:n] - PLAY_AREA_Y
+        cx0 = np.floor(x / self.cell_w).astype(np.intp)
+        cy0 = np.floor(y / self.cell_h).astype(np.intp)
+        # last covered pixel is x + w - 1
+        cx1 = np.floor((x + self._w[:n] - 1) / self.cell_w).astype(np.intp)
+        cy1 = np.floor((y + self._h[:n] - 1) / self.cell_h).astype(np.intp)
+        np.clip(cx0, 0, None, out=cx0)
+        np.clip(cy0, 0, None, out=cy0)
+        np.clip(cx1, None, self.cols - 1, out=cx1)
+        np.clip(cy1, None, self.rows - 1, out=cy1)
+
+        # +1/-1 at the rect corners, then prefix sums give the coverage
+        keep = (cx0 <= cx1) & (cy0 <= cy1)
+        cx0, cy0 = cx0[keep], cy0[keep]
+        cx1, cy1 = cx1[keep] + 1, cy1[keep] + 1
+        diff = self._diff
+        diff[:] = 0
+        np.add.at(diff, (cy0, cx0), 1)
+        np.add.at(diff, (cy0, cx1), -1)
+        np.add.at(diff, (cy1, cx0), -1)
+        np.add.at(diff, (cy1, cx1), 1)
+        cover = diff.cumsum(axis=0).cumsum(axis=1)[:-1, :-1]
+        np.greater(cover, 0, out=layer.view(np.bool_))
+
+    def encode(self, stage, out=None):
+        """The grid of `stage`, (NUM_CHANNELS, rows, cols) uint8. Returns
+        `grid` (overwritten by the next call), or copies into `out`."""
+        grid = self.grid
+        grid[SOLID] = self._solid_cells(stage.background.solid_tiles)
+        grid[PLAYER:] = 0
+
+        player = stage.player
+        if not player.remove:
+            self._x[0] = player.x
+            self._y[0] = player.y
+            self._w[0] = player.w
+            self._h[0] = player.h
+            self._fill(grid[PLAYER], 1)
+
+        for channel, name in SPRITE_CHANNELS:
+            self._fill(grid[channel], self._gather(getattr(stage, name)))
+
+        if out is None:
+            return grid
+        np.copyto(out, grid)
+        return out
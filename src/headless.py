@@ -0,0 +1,199 @@
+"""Render-free stage simulation for training and evaluating agents.
+
+Steps `GameStateStage` without a Pyxel window, audio or draw calls, as fast
+as the CPU allows. Run from the "src" directory like the game itself, since
+assets are loaded from "assets/".
+"""
+import random
+import time
+
+import audio
+from const import StageNum
+from difficulty import DifficultyController
+from game import Game
+from game_vars import GameVars
+from game_data_collector import GameDataCollector
+from game_state_stage import GameStateStage, State
+from input import Input, ButtonSource, ActionSource
+from input import ACTION_INPUTS, NUM_ACTIONS  # noqa: F401 (re-exported)
+
+
+class HeadlessApp:
+    """Stands in for `main.App`: no window, no font, and input from
+    `source` (a `ButtonSource` by default) instead of Pyxel."""
+
+    def __init__(self, source=None) -> None:
+        self.main_font = None
+        self.input = Input(ButtonSource() if source is None else source)
+
+
+class HeadlessGame(Game):
+    """`Game` that skips the title screen and never switches state itself."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+        self.next_state = None
+        self.game_vars = GameVars(self)
+        self.data_collector = GameDataCollector()
+        self.state = None
+
+    def start_stage(self, stage_num, record=False, seed=0,
+                    batched_shots=False):
+        self.game_vars.new_game()
+        self.game_vars.stage_num = StageNum(stage_num)
+        self.game_vars.seed = seed
+        self.data_collector.clear()
+        if record:
+            self.data_collector.start_recording(time.time())
+        self.next_state = None
+        self.state = GameStateStage(self, batched_shots)
+        return self.state
+
+
+class StageEnv:
+    """Single stage environment with a `step(action) -> observation` API.
+
+    An episode ends on game over or when the stage hands control back to the
+    game (stage clear). `reward` holds the score gained by the last step.
+    The stage's clock and RNG are its own, so the same `seed` and actions
+    replay the same episode. `batched_shots` runs enemy shots on the
+    NumPy engine (`enemy_shot_arrays`); results are identical. It may also
+    be a factory for the container, as `GameStateStage` takes it.
+    `adaptive_difficulty` lets a `DifficultyController` move the difficulty
+    during an episode; every `reset` starts back at the level it had when
+    the env was created.
+    """
+
+    def __init__(self, stage_num=StageNum.STAGE_1, auto_fire=True,
+                 max_steps=0, record=False, seed=0,
+                 batched_shots=False, adaptive_difficulty=False) -> None:
+        audio.set_enabled(False)
+        self.stage_num = stage_num
+        self.auto_fire = auto_fire
+        self.max_steps = max_steps
+        self.record = record
+        self.seed = seed
+        self.batched_shots = batched_shots
+
+        self.source = ActionSource(auto_fire)
+        self.app = HeadlessApp(self.source)
+        self.game = HeadlessGame(self.app)
+        self.difficulty_controller = None
+        if adaptive_difficulty:
+            self.difficulty_controller = DifficultyController(
+                self.game.game_vars.difficulty)
+        self.stage = None
+        self.steps = 0
+        self.reward = 0
+        self.done = True
+        self._score = 0
+        self._playing = False
+
+    def reset(self, seed=None):
+        if seed is not None:
+            self.seed = seed
+        if self.difficulty_controller is not None:
+            self.difficulty_controller.reset()
+        self.stage = self.game.start_stage(self.stage_num, self.record,
+                                           self.seed, self.batched_shots)
+        self.steps = 0
+        self.reward = 0
+        self.done = False
+        return self.observation(-1)
+
+    def is_done(self):
+        if self.stage.state == State.GAME_OVER:
+            return True
+        if self.game.next_state is not None:
+            return True
+        return self.max_steps > 0 and self.steps >= self.max_steps
+
+    def step(self, action):
+        self.begin_step(action)
+        self.stage.update()
+        self.end_step()
+        return self.observation(action)
+
+    def begin_step(self, action):
+        """Feed `action` for the next `stage.update()`. `step` is
+        `begin_step`, the update, then `end_step`; `vec_env` runs the
+        update of many envs in phases in between."""
+        if self.done:
+            raise RuntimeError("step() called on finished episode, "
+                               "call reset() first")
+
+        self.source.set_action(action)
+        self.app.input.update()
+
+        self._score = self.game.game_vars.score
+        self._playing = self.stage.state == State.PLAY
+
+    def end_step(self):
+        self.steps += 1
+        if self._playing and self.difficulty_controller is not None:
+            self.difficulty_controller.update(self.stage)
+
+        self.reward = self.game.game_vars.score - self._score
+        self.done = self.is_done()
+
+    def snapshot(self):
+        """Capture the episode so `restore` can branch from this step."""
+        return self.stage.snapshot(), self.steps
+
+    def restore(self, snap):
+        stage_snap, steps = snap
+        self.stage.restore(stage_snap)
+        self.game.next_state = None
+        self.steps = steps
+        self.reward = 0
+        self.done = self.is_done()
+
+    def observation(self, action):
+        """Observation in the master.json frame schema."""
+        stage = self.stage
+        player = stage.player
+        game_vars = self.game.game_vars
+        enemies = [{"x": e.x, "y": e.y} for e in stage.enemies]
+        enemies.extend({"x": b.x, "y": b.y} for b in stage.bosses)
+        return {
+            "step": self.steps,
+            "player": {
+                "x": player.x,
+                "y": player.y,
+                "hp": player.hp,
+                "lives": game_vars.lives,
+            },
+            "enemies": enemies,
+            "bullets": [{"x": s.x, "y": s.y} for s in stage.enemy_shots],
+            "score": game_vars.score,
+            "action": action,
+        }
+
+
+def run_episode(env, policy):
+    """Run one episode, `policy(observation) -> action`. Returns the score."""
+    obs = env.reset()
+    while not env.done:
+        obs = env.step(policy(obs))
+    return env.game.game_vars.score
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Headless stage benchmark")
+    parser.add_argument("--episodes", type=int, default=10)
+    parser.add_argument("--stage", type=int, default=int(StageNum.STAGE_1))
+    parser.add_argument("--max-steps", type=int, default=0)
+    args = parser.parse_args()
+
+    env = StageEnv(args.stage, max_steps=args.max_steps)
+    total_steps = 0
+    start = time.perf_counter()
+    for ep in range(args.episodes):
+        score = run_episode(env, lambda obs: random.randrange(NUM_ACTIONS))
+        total_steps += env.steps
+        print(f"Episode {ep}: steps={env.steps} score={score}")
+    elapsed = time.perf_counter() - start
+    print(f"{total_steps} steps in {elapsed:.2f}s "
+          f"({total_steps / elapsed:.0f} steps/s)")
@@ -1,6 +1,11 @@
 import pyxel as px
 
-from const import MAX_WEAPONS, MAX_WEAPON_LEVEL, WEAPON_NAMES
+from const import MAX_WEAPONS, MAX_WEAPON_LEVEL, WEAPON_NAMES, APP_WIDTH
+
+BAR_HEIGHT = 16
+BOTTOM_BAR_Y = 176
+# 캐시 이미지 안에서 하단 바의 위치 (상단 바 바로 아래)
+CACHE_BOTTOM_Y = BAR_HEIGHT
 
 
 class Hud:
@@ -9,45 +14,74 @@ class Hud:
         self.font = font
         self.player = None  # 플레이어 참조를 나중에 설정
 
-    def draw_weapon_level(self, i, x, y):
-        self.font.draw_text(x + 16, y, WEAPON_NAMES[i])
-        px.blt(x + 24, y, 0, i * 16, 224, 16, 8)
+        # 상/하단 바만 위아래로 붙여 그려 두는 오프스크린 이미지
+        # (표시 값이 바뀔 때만 다시 그림)
+        self.image = None
+        self.image_key = None
+
+    def get_state_key(self):
+        """HUD에 표시되는 값 전체 (바뀌면 다시 그림)"""
+        gv = self.game_vars
+        hp = None
+        if self.player and hasattr(self.player, "hp"):
+            hp = self.player.hp
+        return (gv.score, gv.hi_score, gv.current_weapon, gv.lives,
+                tuple(gv.weapon_levels), hp)
+
+    def draw_weapon_level(self, img, i, x, y):
+        self.font.draw_text(x + 16, y, WEAPON_NAMES[i], img)
+        img.blt(x + 24, y, 0, i * 16, 224, 16, 8)
 
         j = 0
         while j <= self.game_vars.weapon_levels[i]:
-            px.blt(x + (j * 8), y + 8, 0, 32, 232, 8, 8)
+            img.blt(x + (j * 8), y + 8, 0, 32, 232, 8, 8)
             j += 1
         while j <= MAX_WEAPON_LEVEL:
-            px.blt(x + (j * 8), y + 8, 0, 40, 232, 8, 8)
+            img.blt(x + (j * 8), y + 8, 0, 40, 232, 8, 8)
             j += 1
 
-    def draw(self):
+    def render(self, img):
+        """상단 바는 y=0, 하단 바는 y=CACHE_BOTTOM_Y에 오도록 img에 그림"""
+        bottom = CACHE_BOTTOM_Y
+
         # top and bottom bg
-        px.rect(0, 0, 256, 16, 1)
-        px.rect(0, 176, 256, 16, 1)
+        img.rect(0, 0, 256, 16, 1)
+        img.rect(0, bottom, 256, 16, 1)
 
         # top
-        self.font.draw_text(24, 0, "1UP")
-        self.font.draw_text(16, 8, f"{self.game_vars.score:06}")
+        self.font.draw_text(24, 0, "1UP", img)
+        self.font.draw_text(16, 8, f"{self.game_vars.score:06}", img)
 
-        self.font.draw_text(96, 0, "HI-SCORE")
-        self.font.draw_text(104, 8, f"{self.game_vars.hi_score:06}")
+        self.font.draw_text(96, 0, "HI-SCORE", img)
+        self.font.draw_text(104, 8, f"{self.game_vars.hi_score:06}", img)
 
-        self.font.draw_text(176, 0, "ARM")
-        self.font.draw_text(176, 8, WEAPON_NAMES[self.game_vars.current_weapon])
-        px.blt(184, 8, 0, self.game_vars.current_weapon * 16, 224, 16, 8)
+        self.font.draw_text(176, 0, "ARM", img)
+        self.font.draw_text(176, 8, WEAPON_NAMES[self.game_vars.current_weapon], img)
+        img.blt(184, 8, 0, self.game_vars.current_weapon * 16, 224, 16, 8)
 
-        px.blt(216, 0, 0, 0, 4, 16, 8, 0)
-        self.font.draw_text(224, 8, f"{self.game_vars.lives}")
+        img.blt(216, 0, 0, 0, 4, 16, 8, 0)
+        self.font.draw_text(224, 8, f"{self.game_vars.lives}", img)
 
         # 플레이어 체력 표시 (HP)
         if self.player and hasattr(self.player, "hp"):
-            self.font.draw_text(200, 0, "HP")
-            self.font.draw_text(208, 8, f"{self.player.hp}")
+            self.font.draw_text(200, 0, "HP", img)
+            self.font.draw_text(208, 8, f"{self.player.hp}", img)
 
         # bottom
-        self.font.draw_text(16, 176, "ARM")
-        self.font.draw_text(16, 184, "LVL")
+        self.font.draw_text(16, bottom, "ARM", img)
+        self.font.draw_text(16, bottom + 8, "LVL", img)
 
         for i in range(MAX_WEAPONS):
-            self.draw_weapon_level(i, 56 + (64 * i), 176)
+            self.draw_weapon_level(img, i, 56 + (64 * i), bottom)
+
+    def draw(self):
+        if self.image is None:
+            self.image = px.Image(APP_WIDTH, 2 * BAR_HEIGHT)
+        key = self.get_state_key()
+        if key != self.image_key:
+            self.render(self.image)
+            self.image_key = key
+
+        px.blt(0, 0, self.image, 0, 0, APP_WIDTH, BAR_HEIGHT)
+        px.blt(0, BOTTOM_BAR_Y, self.image, 0, CACHE_BOTTOM_Y,
+               APP_WIDTH, BAR_HEIGHT)
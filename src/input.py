@@ -1,3 +1,4 @@
+from abc import ABC, abstractmethod
 
 import pyxel as px
 
@@ -8,69 +9,154 @@ RIGHT = 3
 BUTTON_1 = 4
 BUTTON_2 = 5
 BUTTON_INVINCIBLE = 6
+BUTTON_SPEED = 7
+
+# Buttons agents and replays can hold: movement and fire. Pause is left
+# out, a recorded tap of it would pause the stage on playback.
+AGENT_BUTTONS = (1 << UP) | (1 << DOWN) | (1 << LEFT) | (1 << RIGHT) | \
+    (1 << BUTTON_1)
+
+# 9-way movement plus fire, the `action` of master.json frames. Vertical
+# components match the recorded agent episodes.
+ACTION_INPUTS = (
+    (1 << UP),
+    (1 << UP) | (1 << LEFT),
+    (1 << UP) | (1 << RIGHT),
+    (1 << LEFT),
+    (1 << RIGHT),
+    (1 << DOWN),
+    (1 << DOWN) | (1 << LEFT),
+    (1 << DOWN) | (1 << RIGHT),
+    0,
+    (1 << BUTTON_1),
+)
+NUM_ACTIONS = len(ACTION_INPUTS)
+
+# (button, keys); a pair's second button only counts if the first isn't
+# held (up beats down, left beats right)
+KEYS_PRESSING = (
+    ((UP, (px.KEY_UP, px.KEY_W, px.GAMEPAD1_BUTTON_DPAD_UP)),
+     (DOWN, (px.KEY_DOWN, px.KEY_S, px.GAMEPAD1_BUTTON_DPAD_DOWN))),
+    ((LEFT, (px.KEY_LEFT, px.KEY_A, px.GAMEPAD1_BUTTON_DPAD_LEFT)),
+     (RIGHT, (px.KEY_RIGHT, px.KEY_D, px.GAMEPAD1_BUTTON_DPAD_RIGHT))),
+    ((BUTTON_1, (px.KEY_Z, px.KEY_U, px.GAMEPAD1_BUTTON_A)),),
+    ((BUTTON_2, (px.KEY_X, px.KEY_I, px.GAMEPAD1_BUTTON_B)),),
+)
+KEYS_TAPPED = (
+    KEYS_PRESSING[0],
+    KEYS_PRESSING[1],
+    KEYS_PRESSING[2],
+    # i 키는 무적 모드 토글용으로 별도 처리
+    ((BUTTON_2, (px.KEY_X, px.GAMEPAD1_BUTTON_B)),),
+    ((BUTTON_INVINCIBLE, (px.KEY_I,)),),
+    # 재생 속도 변경 (main.App)
+    ((BUTTON_SPEED, (px.KEY_F,)),),
+)
+
+
+def _poll_keys(table, check):
+    bits = 0
+    for group in table:
+        for button, keys in group:
+            if any(check(k) for k in keys):
+                bits |= 1 << button
+                break
+    return bits
+
+
+class InputSource(ABC):
+    """Where `Input` gets each frame's buttons from.
+
+    `interactive` sources can tap, which the title, pause and stage
+    transition screens wait for; only those can drive `main.App`.
+    """
+
+    interactive = False
+
+    @abstractmethod
+    def poll(self):
+        """(pressing, tapped) button bitmasks for this frame."""
+        raise NotImplementedError
+
+
+class KeyboardSource(InputSource):
+    """Keyboard and gamepad, polled through Pyxel."""
+
+    interactive = True
+
+    def poll(self):
+        return _poll_keys(KEYS_PRESSING, px.btn), \
+            _poll_keys(KEYS_TAPPED, px.btnp)
+
+
+class ButtonSource(InputSource):
+    """Buttons set by code, held until changed. Never taps."""
+
+    def __init__(self) -> None:
+        self.buttons = 0
+
+    def set_buttons(self, buttons):
+        self.buttons = buttons & AGENT_BUTTONS
+
+    def poll(self):
+        return self.buttons, 0
+
+
+class ActionSource(ButtonSource):
+    """Buttons of a policy's `ACTION_INPUTS` index, optionally always
+    firing."""
+
+    def __init__(self, auto_fire=False) -> None:
+        super().__init__()
+        self.auto_fire = auto_fire
+
+    def set_action(self, action):
+        buttons = ACTION_INPUTS[action]
+        if self.auto_fire:
+            buttons |= 1 << BUTTON_1
+        self.set_buttons(buttons)
+
+
+class ReplaySource(InputSource):
+    """Recorded pressing bits, one per poll. While `paused` (outside the
+    frames that were recorded) polls give no buttons and don't advance.
+    After the last frame nothing is held."""
+
+    def __init__(self, frames) -> None:
+        self.frames = frames
+        self.index = 0
+        self.paused = False
+
+    def is_finished(self):
+        return self.index >= len(self.frames)
+
+    def poll(self):
+        if self.paused or self.is_finished():
+            return 0, 0
+        bits = self.frames[self.index] & AGENT_BUTTONS
+        self.index += 1
+        return bits, 0
+
 
 class Input:
-    def __init__(self):
-        self.pressing = []
-        self.tapped = []
+    """This frame's buttons as bitmasks, read from `source` by `update`."""
+
+    def __init__(self, source=None):
+        self.source = KeyboardSource() if source is None else source
+        self.pressing_bits = 0
+        self.tapped_bits = 0
 
     def is_pressing(self, i):
-        return i in self.pressing
-    
+        return self.pressing_bits & (1 << i) != 0
+
     def has_tapped(self, i):
-        return i in self.tapped
-        
+        return self.tapped_bits & (1 << i) != 0
+
+    def get_pressing_bits(self):
+        return self.pressing_bits
+
+    def clear_tapped(self):
+        self.tapped_bits = 0
+
     def update(self):
-        self.pressing.clear()
-        self.tapped.clear()
-    
-        # pressing
-        if px.btn(px.KEY_UP) or px.btn(px.KEY_W) or \
-            px.btn(px.GAMEPAD1_BUTTON_DPAD_UP):
-            self.pressing.append(UP)
-        elif px.btn(px.KEY_DOWN) or px.btn(px.KEY_S) or \
-            px.btn(px.GAMEPAD1_BUTTON_DPAD_DOWN):
-            self.pressing.append(DOWN)
-            
-        if px.btn(px.KEY_LEFT) or px.btn(px.KEY_A) or \
-            px.btn(px.GAMEPAD1_BUTTON_DPAD_LEFT):
-            self.pressing.append(LEFT)
-        elif px.btn(px.KEY_RIGHT) or px.btn(px.KEY_D) or \
-            px.btn(px.GAMEPAD1_BUTTON_DPAD_RIGHT):
-            self.pressing.append(RIGHT)
-        
-        if px.btn(px.KEY_Z) or px.btn(px.KEY_U) or \
-            px.btn(px.GAMEPAD1_BUTTON_A):
-            self.pressing.append(BUTTON_1)
-        
-        if px.btn(px.KEY_X) or px.btn(px.KEY_I) or \
-            px.btn(px.GAMEPAD1_BUTTON_B):
-            self.pressing.append(BUTTON_2)
-            
-        # tapped
-        if px.btnp(px.KEY_UP) or px.btnp(px.KEY_W) or \
-            px.btnp(px.GAMEPAD1_BUTTON_DPAD_UP):
-            self.tapped.append(UP)
-        elif px.btnp(px.KEY_DOWN) or px.btnp(px.KEY_S) or \
-            px.btnp(px.GAMEPAD1_BUTTON_DPAD_DOWN):
-            self.tapped.append(DOWN)
-            
-        if px.btnp(px.KEY_LEFT) or px.btnp(px.KEY_A) or \
-            px.btnp(px.GAMEPAD1_BUTTON_DPAD_LEFT):
-            self.tapped.append(LEFT)
-        elif px.btnp(px.KEY_RIGHT) or px.btnp(px.KEY_D) or \
-            px.btnp(px.GAMEPAD1_BUTTON_DPAD_RIGHT):
-            self.tapped.append(RIGHT)
-        
-        if px.btnp(px.KEY_Z) or px.btnp(px.KEY_U) or \
-            px.btnp(px.GAMEPAD1_BUTTON_A):
-            self.tapped.append(BUTTON_1)
-        
-        if px.btnp(px.KEY_X) or \
-            px.btnp(px.GAMEPAD1_BUTTON_B):
-            self.tapped.append(BUTTON_2)
-        
-        # i 키는 무적 모드 토글용으로 별도 처리
-        if px.btnp(px.KEY_I):
-            self.tapped.append(BUTTON_INVINCIBLE)
-            
\ No newline at end of file
+        self.pressing_bits, self.tapped_bits = self.source.poll()
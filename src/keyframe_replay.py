@@ -0,0 +1,258 @@
+"""Replay files with periodic stage keyframes, for seeking without replaying
+from the start.
+
+File layout (integers little endian):
+
+    header     b"VXKR", u32 version, u64 index offset
+    inputs     zlib(JSON compact replay, see `replay_codec`)
+    keyframes  zlib(JSON `stage_snapshot.to_dict()`), one block each
+    index      JSON: frame count, seed, keyframe interval and the
+               [offset, length] of the inputs block and of every keyframe
+
+Frame i is the i-th recorded frame, i.e. the i-th stage update in the PLAY
+state, which applies input i. The keyframe for frame i is the game state
+just before that update. Seeking reads the index, restores the nearest
+keyframe at or before the target and re-simulates only the frames after it.
+Run from "src" like the game.
+
+Only recordings of this game (`GameDataCollector` exports, in either
+`replay_codec` format) can be converted. Agent recordings such as
+master.json (`step`/`action` frames) come from the training environment:
+replaying their actions here does not reproduce their player positions
+(master.json moves 2 px a frame regardless of the action), so `build`
+rejects them rather than index a replay that diverges from frame 0.
+"""
+import bisect
+import json
+import struct
+import zlib
+
+import audio
+import replay_codec
+import stage_snapshot
+from game import GameState
+from game_state_stage import GameStateStage, State
+from headless import HeadlessApp, HeadlessGame
+from input import ReplaySource
+
+MAGIC = b"VXKR"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sIQ")
+DEFAULT_KEYFRAME_INTERVAL = replay_codec.DEFAULT_KEYFRAME_INTERVAL
+
+
+class ReplaySimulator:
+    """Feeds recorded inputs to a headless game, one recorded frame per step.
+
+    Inputs only reach the stage in the PLAY state, where they were recorded;
+    other states (spawning, dying, stage clear) run with no buttons held.
+    """
+
+    def __init__(self, inputs, stage_num, seed=0) -> None:
+        audio.set_enabled(False)
+        self.inputs = inputs
+        self.source = ReplaySource(inputs)
+        self.app = HeadlessApp(self.source)
+        self.game = HeadlessGame(self.app)
+        self.stage = self.game.start_stage(stage_num, seed=seed)
+        self.game.state = self.stage
+        self.position = None  # player position recorded with the last frame
+
+    @property
+    def frame(self):
+        """Recorded frames consumed so far."""
+        return self.source.index
+
+    def _enter_stage(self):
+        self.stage = GameStateStage(self.game)
+        self.game.state = self.stage
+        self.game.next_state = None
+
+    def is_running(self):
+        """Follows stage clears into the next stage; False once it's over."""
+        if self.game.next_state == GameState.STAGE:
+            self.stage.on_exit()
+            self._enter_stage()
+        return self.game.next_state is None and \
+            self.stage.state != State.GAME_OVER
+
+    def step(self):
+        """Run stage updates up to the one consuming input `frame`."""
+        if self.source.is_finished():
+            return False
+        while self.is_running():
+            playing = self.stage.state == State.PLAY
+            if playing:
+                player = self.stage.player
+                self.position = (player.x, player.y)
+            self.source.paused = not playing
+            self.app.input.update()
+            self.stage.update()
+            if playing:
+                return True
+        return False
+
+    def restore(self, frame, snap):
+        if self.game.game_vars.stage_num != snap.stage_num:
+            self.game.game_vars.stage_num = snap.stage_num
+            self._enter_stage()
+        self.stage.restore(snap)
+        self.game.next_state = None
+        self.source.index = frame
+
+
+def _write_block(fout, data):
+    blob = zlib.compress(json.dumps(data, separators=(",", ":")).encode())
+    offset = fout.tell()
+    fout.write(blob)
+    return [offset, len(blob)]
+
+
+def check_schema(game_data):
+    """Raise ValueError unless `game_data` is a recording `build` takes."""
+    if replay_codec.is_compact(game_data):
+        return
+    frames = game_data.get("frames")
+    if not isinstance(frames, list):
+        raise ValueError("not a game recording: no \"frames\" list")
+    if frames and "frame_number" not in frames[0]:
+        if "step" in frames[0] and "action" in frames[0]:
+            raise ValueError(
+                "agent recordings (step/action frames, like master.json) "
+                "can't be made seekable: their actions don't reproduce the "
+                "recorded play in this simulation")
+        raise ValueError("not a game recording: frames have no "
+                         "\"frame_number\"")
+
+
+def build(game_data, path, keyframe_interval=DEFAULT_KEYFRAME_INTERVAL,
+          seed=0):
+    """Write a keyframe replay of `game_data` (either replay format).
+
+    Keyframes come from re-simulating the inputs. Returns the index; its
+    "first_divergence" is the first frame where the simulated player is not
+    where the recording has it (None if the whole replay reproduces).
+    Raises ValueError for data `check_schema` rejects.
+    """
+    check_schema(game_data)
+    compact = game_data if replay_codec.is_compact(game_data) \
+        else replay_codec.encode(game_data)
+    cols = replay_codec.decode_columns(compact["frames"])
+    inputs = cols["inputs"]
+    stage_num = cols["stage_num"][0] if inputs else 1
+
+    sim = ReplaySimulator(inputs, stage_num, seed)
+    keyframes = []
+    first_divergence = None
+    with open(path, "wb") as fout:
+        fout.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0))
+        inputs_block = _write_block(fout, compact)
+        while True:
+            frame = sim.frame
+            if frame % keyframe_interval == 0:
+                snap = stage_snapshot.to_dict(sim.stage.snapshot())
+                keyframes.append([frame] + _write_block(fout, snap))
+            if not sim.step():
+                break
+            if first_divergence is None and sim.position != \
+                    (cols["player_x"][frame], cols["player_y"][frame]):
+                first_divergence = frame
+
+        index = {
+            "frame_count": len(inputs),
+            "simulated_frames": sim.frame,
+            "first_divergence": first_divergence,
+            "seed": seed,
+            "keyframe_interval": keyframe_interval,
+            "inputs": inputs_block,
+            "keyframes": keyframes,
+        }
+        index_offset = fout.tell()
+        fout.write(json.dumps(index).encode())
+        fout.seek(0)
+        fout.write(HEADER.pack(MAGIC, FORMAT_VERSION, index_offset))
+    return index
+
+
+class KeyframeReplay:
+    """Reader for files written by `build`; blocks are read on demand."""
+
+    def __init__(self, path) -> None:
+        self.path = path
+        with open(path, "rb") as fin:
+            magic, version, index_offset = HEADER.unpack(
+                fin.read(HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a keyframe replay")
+            if version > FORMAT_VERSION:
+                raise ValueError(f"unsupported keyframe replay version "
+                                 f"{version}")
+            fin.seek(index_offset)
+            self.index = json.loads(fin.read())
+        self.frame_count = self.index["frame_count"]
+        self.keyframe_frames = [k[0] for k in self.index["keyframes"]]
+        self._inputs = None
+
+    def _read_block(self, entry):
+        offset, length = entry
+        with open(self.path, "rb") as fin:
+            fin.seek(offset)
+            return json.loads(zlib.decompress(fin.read(length)))
+
+    def read_compact(self):
+        return self._read_block(self.index["inputs"])
+
+    def read_replay(self):
+        """The recording as an export_data() dict."""
+        return replay_codec.decode(self.read_compact())
+
+    def inputs(self):
+        if self._inputs is None:
+            self._inputs = replay_codec.decode_columns(
+                self.read_compact()["frames"])["inputs"]
+        return self._inputs
+
+    def read_keyframe(self, i):
+        return stage_snapshot.from_dict(
+            self._read_block(self.index["keyframes"][i][1:]))
+
+    def seek(self, frame):
+        """A `ReplaySimulator` positioned just before recorded `frame`."""
+        if not 0 <= frame <= self.frame_count:
+            raise IndexError(f"frame {frame} out of range")
+        i = bisect.bisect_right(self.keyframe_frames, frame) - 1
+        snap = self.read_keyframe(i)
+        sim = ReplaySimulator(self.inputs(), snap.stage_num,
+                              self.index["seed"])
+        sim.restore(self.keyframe_frames[i], snap)
+        while sim.frame < frame and sim.step():
+            pass
+        return sim
+
+
+if __name__ == "__main__":
+    import argparse
+    import os
+
+    parser = argparse.ArgumentParser(
+        description="Convert a replay into a keyframe replay")
+    parser.add_argument("replay")
+    parser.add_argument("output")
+    parser.add_argument("--interval", type=int,
+                        default=DEFAULT_KEYFRAME_INTERVAL)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with open(args.replay, "rt", encoding="utf-8") as fin:
+        data = json.load(fin)
+    try:
+        check_schema(data)
+    except ValueError as e:
+        parser.error(f"{args.replay}: {e}")
+    index = build(data, args.output, args.interval, args.seed)
+    print(f"{args.output}: {index['frame_count']} frames, "
+          f"{len(index['keyframes'])} keyframes, "
+          f"{os.path.getsize(args.output)} bytes")
+    if index["first_divergence"] is not None:
+        print(f"warning: simulation diverges from the recording at frame "
+              f"{index['first_divergence']}")
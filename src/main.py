@@ -1,14 +1,26 @@
 
+import sys
+import time
+
 import pyxel as px
 from game import Game
 
+import audio
 from const import APP_WIDTH, APP_HEIGHT, APP_NAME, APP_DISPLAY_SCALE, \
-    APP_CAPTURE_SCALE, APP_FPS, APP_GFX_FILE, PALETTE, SOUNDS_RES_FILE
+    APP_CAPTURE_SCALE, APP_FPS, APP_GFX_FILE, PALETTE, SOUNDS_RES_FILE, \
+    PLAYBACK_SPEEDS, PLAYBACK_MAX, PLAYBACK_MAX_BUDGET
 from monospace_bitmap_font import MonospaceBitmapFont
+import input
 from input import Input
 
 class App:
-    def __init__(self) -> None:
+    def __init__(self, playback_speed=1, input_source=None) -> None:
+        """`input_source` must be interactive (see `input.InputSource`):
+        the title, pause and stage transition screens wait for taps."""
+        if input_source is not None and not input_source.interactive:
+            raise ValueError(
+                "App needs an interactive input source; play recorded or "
+                "agent input with keyframe_replay or headless instead")
         px.init(
             APP_WIDTH, APP_HEIGHT, 
             title=APP_NAME,
@@ -23,19 +35,73 @@ class App:
                 excl_tilemaps=True, excl_musics=True)
 
         self.main_font = MonospaceBitmapFont()
-        self.input = Input()
+        self.input = Input(input_source)
 
         self.game = Game(self)
+        self.playback_speed = 1
+        self.set_playback_speed(playback_speed)
         
         px.run(self.update, self.draw)
     
+    def set_playback_speed(self, speed):
+        """Game updates per drawn frame: one of PLAYBACK_SPEEDS, or
+        PLAYBACK_MAX to run as many as fit in PLAYBACK_MAX_BUDGET.
+
+        Above 1x the music is muted and each frame plays at most one sound.
+        """
+        if speed != PLAYBACK_MAX and speed not in PLAYBACK_SPEEDS:
+            raise ValueError(f"unsupported playback speed {speed}")
+        self.playback_speed = speed
+        audio.set_fast_forward(speed != 1)
+
+    def cycle_playback_speed(self):
+        """Next of PLAYBACK_SPEEDS, back to 1x after the last (or MAX)."""
+        if self.playback_speed == PLAYBACK_MAX:
+            i = len(PLAYBACK_SPEEDS) - 1
+        else:
+            i = PLAYBACK_SPEEDS.index(self.playback_speed)
+        i = (i + 1) % len(PLAYBACK_SPEEDS)
+        self.set_playback_speed(PLAYBACK_SPEEDS[i])
+
     def update(self):
+        deadline = time.perf_counter() + PLAYBACK_MAX_BUDGET
         self.input.update()
+        if self.input.has_tapped(input.BUTTON_SPEED):
+            self.cycle_playback_speed()
         self.game.update()
+        if self.playback_speed == 1:
+            return
+
+        # 입력은 프레임당 한 번만 읽음 (탭은 첫 업데이트에만 적용)
+        self.input.clear_tapped()
+        if self.playback_speed == PLAYBACK_MAX:
+            while time.perf_counter() < deadline:
+                self.game.update()
+        else:
+            for _ in range(self.playback_speed - 1):
+                self.game.update()
+        audio.flush_sounds()
     
     def draw(self):
         px.cls(0)
         self.game.draw()
     
+def parse_speed(text):
+    if text == "max":
+        return PLAYBACK_MAX
+    speed = int(text)
+    if speed not in PLAYBACK_SPEEDS:
+        raise ValueError(text)
+    return speed
+
+
 if __name__ == "__main__":
-    App()
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="main.py", description=APP_NAME)
+    parser.add_argument(
+        "--speed", type=parse_speed, default=1,
+        help="playback speed: " + ", ".join(map(str, PLAYBACK_SPEEDS))
+        + " or max (F key cycles it while running)")
+    args = parser.parse_args(sys.argv[1:])
+    App(args.speed)
@@ -1,6 +1,11 @@
+from collections import OrderedDict
 
 import pyxel as px
 
+FIRST_CHAR = 32
+LAST_CHAR = 95
+MAX_CACHED_STRINGS = 128
+
 class MonospaceBitmapFont:
     def __init__(self) -> None:
         self.width = 8
@@ -8,19 +13,55 @@ class MonospaceBitmapFont:
         self.uv_chars_wide = 32 # chars per image width
         self.u_offset = 0
         self.v_offset = 240
-    
-    def draw_text(self, x, y, text):
-        for char in text:
-            code = ord(char)
-            if code < 32 or code > 95:
-                x += self.width
+
+        # (u, v) of each drawable char code in image bank 0
+        self.glyph_uv = {}
+        for code in range(FIRST_CHAR, LAST_CHAR + 1):
+            i = code - FIRST_CHAR
+            self.glyph_uv[code] = (
+                self.u_offset + (i % self.uv_chars_wide) * self.width,
+                self.v_offset + (i // self.uv_chars_wide) * self.height,
+            )
+
+        # text -> [(x offset, strip image, width)], least recently used first
+        self.strips = OrderedDict()
+
+    def render_strips(self, text):
+        """Pre-render each run of drawable chars into its own image.
+
+        Undrawable chars are skipped, leaving what is under them, so they
+        split the text into separate strips.
+        """
+        strips = []
+        run = []
+        for i, char in enumerate(text + "\0"):
+            uv = self.glyph_uv.get(ord(char))
+            if uv is not None:
+                run.append(uv)
                 continue
-            code -= 32
-            px.blt(x, y, 0, 
-                   self.u_offset + \
-                    (px.floor(code % self.uv_chars_wide) * self.width), 
-                   self.v_offset + \
-                    (px.floor(code / self.uv_chars_wide) * self.height), 
-                   self.width, self.height)
-            x += self.width
-        
\ No newline at end of file
+            if run:
+                w = len(run) * self.width
+                img = px.Image(w, self.height)
+                for j, (u, v) in enumerate(run):
+                    img.blt(j * self.width, 0, 0, u, v,
+                            self.width, self.height)
+                strips.append(((i - len(run)) * self.width, img, w))
+                run = []
+        return strips
+
+    def get_strips(self, text):
+        strips = self.strips.get(text)
+        if strips is None:
+            strips = self.render_strips(text)
+            self.strips[text] = strips
+            if len(self.strips) > MAX_CACHED_STRINGS:
+                self.strips.popitem(last=False)
+        else:
+            self.strips.move_to_end(text)
+        return strips
+
+    def draw_text(self, x, y, text, target=None):
+        """Draw to the screen, or into the `px.Image` `target`."""
+        blt = px.blt if target is None else target.blt
+        for dx, img, w in self.get_strips(text):
+            blt(x + dx, y, img, 0, 0, w, self.height)
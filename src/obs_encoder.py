@@ -0,0 +1,203 @@
+"""Fixed-shape NumPy observations of a `GameStateStage` for policies.
+
+Encodes the same information as a master.json frame (player, enemies,
+bullets, score) plus boss and weapon state, into one flat float32 vector
+with named views:
+
+    player      x, y, hp, lives, invincible, score
+    enemies     nearest `max_enemies` enemies: dx, dy, hp, mask
+    shots       nearest `max_shots` enemy shots: dx, dy, vx, vy, mask
+    boss        present, dx, dy, hp, hit
+    weapon      current weapon one-hot, then each weapon's level
+
+Every field is scaled to about [-1, 1]: the player position maps the
+screen onto [-1, 1], offsets from the player are divided by the screen
+size, hp, lives, score and weapon levels by their maximums and shot
+velocities by `SHOT_SPEED_SCALE`. Slots are sorted nearest first and
+unused ones are all zero (mask 0). The default slot counts cover the most
+enemies and shots seen on screen at once in any stage, with headroom.
+This is its own layout: the models in "models" were trained on different
+features and can't take it as input.
+
+The output and the per-entity scratch arrays are reused between calls; only
+the nearest-K selection allocates (index arrays of at most K entries).
+"""
+import numpy as np
+
+from const import APP_WIDTH, APP_HEIGHT, MAX_LIVES, MAX_SCORE, \
+    MAX_WEAPONS, MAX_WEAPON_LEVEL
+from difficulty import LEVEL_RANGES
+from player import PLAYER_MAX_HP
+
+PLAYER_FEATURES = 6
+ENEMY_FEATURES = 4
+SHOT_FEATURES = 5
+BOSS_FEATURES = 5
+WEAPON_FEATURES = 2 * MAX_WEAPONS
+
+DEFAULT_MAX_ENEMIES = 12
+DEFAULT_MAX_SHOTS = 24
+
+HALF_W = APP_WIDTH / 2
+HALF_H = APP_HEIGHT / 2
+# enemy hp is 2 as designed, scaled by the difficulty up to its hardest
+HP_SCALE = 2 * LEVEL_RANGES["enemy_hp"][1]
+# fastest enemy bullet (EnemyP, 4 px/frame) at the hardest difficulty
+SHOT_SPEED_SCALE = 4 * LEVEL_RANGES["bullet_speed"][1]
+
+
+def encoded_size(max_enemies=DEFAULT_MAX_ENEMIES,
+                 max_shots=DEFAULT_MAX_SHOTS):
+    return (PLAYER_FEATURES + max_enemies * ENEMY_FEATURES
+            + max_shots * SHOT_FEATURES + BOSS_FEATURES + WEAPON_FEATURES)
+
+
+class _Scratch:
+    """Growable per-entity columns, reused between frames."""
+
+    def __init__(self, names, capacity=64) -> None:
+        self.names = names
+        self._alloc(capacity)
+
+    def _alloc(self, capacity):
+        self.capacity = capacity
+        for name in self.names:
+            setattr(self, name, np.zeros(capacity, dtype=np.float32))
+        self.dist = np.zeros(capacity, dtype=np.float32)
+        self.tmp = np.zeros(capacity, dtype=np.float32)
+
+    def reserve(self, n):
+        if n > self.capacity:
+            self._alloc(max(n, self.capacity * 2))
+
+
+def _nearest(dist, n, k):
+    """Indices of the (at most) `k` smallest of `dist[:n]`, nearest first."""
+    d = dist[:n]
+    if n > k:
+        idx = np.argpartition(d, k - 1)[:k]
+        return idx[np.argsort(d[idx], kind="stable")]
+    return np.argsort(d, kind="stable")
+
+
+class ObservationEncoder:
+    def __init__(self, max_enemies=DEFAULT_MAX_ENEMIES,
+                 max_shots=DEFAULT_MAX_SHOTS) -> None:
+        self.max_enemies = max_enemies
+        self.max_shots = max_shots
+        self.size = encoded_size(max_enemies, max_shots)
+        self.shape = (self.size,)
+        self.dtype = np.float32
+        self.buffer = np.zeros(self.size, dtype=self.dtype)
+
+        views = []
+        pos = 0
+        for shape in ((PLAYER_FEATURES,),
+                      (max_enemies, ENEMY_FEATURES),
+                      (max_shots, SHOT_FEATURES),
+                      (BOSS_FEATURES,),
+                      (WEAPON_FEATURES,)):
+            n = int(np.prod(shape))
+            views.append(self.buffer[pos:pos + n].reshape(shape))
+            pos += n
+        self.player, self.enemies, self.shots, self.boss, self.weapon = views
+
+        self._enemy_cols = _Scratch(("dx", "dy", "hp"))
+        self._shot_cols = _Scratch(("dx", "dy", "vx", "vy"))
+
+    def encode(self, stage, out=None):
+        """Encode `stage`; returns `buffer` (overwritten by the next call),
+        or copies into the float32 array `out` and returns that."""
+        player = stage.player
+        game_vars = stage.game.game_vars
+        x0, y0 = player.x, player.y
+
+        p = self.player
+        p[0] = x0 / HALF_W - 1
+        p[1] = y0 / HALF_H - 1
+        p[2] = player.hp / PLAYER_MAX_HP
+        p[3] = game_vars.lives / MAX_LIVES
+        p[4] = player.is_invincible()
+        p[5] = game_vars.score / MAX_SCORE
+
+        self._encode_enemies(stage.enemies, x0, y0)
+        self._encode_shots(stage.enemy_shots, x0, y0)
+
+        b = self.boss
+        b[:] = 0
+        if stage.bosses:
+            boss = stage.bosses[0]
+            b[0] = 1
+            b[1] = (boss.x - x0) / APP_WIDTH
+            b[2] = (boss.y - y0) / APP_HEIGHT
+            b[3] = boss.hp / HP_SCALE
+            b[4] = boss.hit_frames > 0
+
+        w = self.weapon
+        w[:] = 0
+        w[game_vars.current_weapon] = 1
+        w[MAX_WEAPONS:] = game_vars.weapon_levels
+        w[MAX_WEAPONS:] /= MAX_WEAPON_LEVEL
+
+        if out is None:
+            return self.buffer
+        np.copyto(out, self.buffer)
+        return out
+
+    def _encode_enemies(self, enemies, x0, y0):
+        rows = self.enemies
+        rows[:] = 0
+        n = len(enemies)
+        if n == 0:
+            return
+        cols = self._enemy_cols
+        cols.reserve(n)
+        dx, dy, hp = cols.dx, cols.dy, cols.hp
+        for i, e in enumerate(enemies):
+            dx[i] = e.x - x0
+            dy[i] = e.y - y0
+            hp[i] = e.hp
+        self._fill(rows, cols, n, (dx, dy, hp),
+                   (1 / APP_WIDTH, 1 / APP_HEIGHT, 1 / HP_SCALE))
+
+    def _encode_shots(self, shots, x0, y0):
+        rows = self.shots
+        rows[:] = 0
+        n = len(shots)
+        if n == 0:
+            return
+        cols = self._shot_cols
+        cols.reserve(n)
+        dx, dy, vx, vy = cols.dx, cols.dy, cols.vx, cols.vy
+        if hasattr(shots, "vx"):
+            # EnemyShotArrays: straight from its columns
+            np.subtract(shots.x[:n], x0, out=dx[:n])
+            np.subtract(shots.y[:n], y0, out=dy[:n])
+            vx[:n] = shots.vx[:n]
+            vy[:n] = shots.vy[:n]
+        else:
+            for i, s in enumerate(shots):
+                dx[i] = s.x - x0
+                dy[i] = s.y - y0
+                vx[i] = s.vx
+                vy[i] = s.vy
+        self._fill(rows, cols, n, (dx, dy, vx, vy),
+                   (1 / APP_WIDTH, 1 / APP_HEIGHT, 1 / SHOT_SPEED_SCALE,
+                    1 / SHOT_SPEED_SCALE))
+
+    @staticmethod
+    def _fill(rows, cols, n, features, scales):
+        """Rows of the nearest entities (by pixel distance), each feature
+        multiplied by its scale."""
+        dx = cols.dx[:n]
+        dy = cols.dy[:n]
+        dist = cols.dist[:n]
+        tmp = cols.tmp[:n]
+        np.multiply(dx, dx, out=dist)
+        np.multiply(dy, dy, out=tmp)
+        dist += tmp
+        idx = _nearest(cols.dist, n, len(rows))
+        k = len(idx)
+        for j, (f, scale) in enumerate(zip(features, scales)):
+            np.multiply(f[idx], scale, out=rows[:k, j])
+        rows[:k, -1] = 1
@@ -10,9 +10,32 @@ SHOT_DELAY = 10  # frames
 INVINCIBILITY_FRAMES = 120
 PLAYER_MAX_HP = 2
 HIT_INVINCIBILITY_FRAMES = 60
+WIDTH = 16
+HEIGHT = 8
+
+
+def moved_position(x, y, w, h, move_x, move_y):
+    """Position after one frame of movement; move_x/move_y are -1, 0 or 1."""
+    if move_x != 0 and move_y != 0:
+        move_x *= MOVE_SPEED_DIAGONAL
+        move_y *= MOVE_SPEED_DIAGONAL
+        x = max(0, min(APP_WIDTH - w, x + move_x))
+        y = max(16, min(APP_HEIGHT - 16 - h, y + move_y))
+    elif move_x != 0:
+        move_x *= MOVE_SPEED
+        x = max(0, min(APP_WIDTH - w, x + move_x))
+    elif move_y != 0:
+        move_y *= MOVE_SPEED
+        y = max(16, min(APP_HEIGHT - 16 - h, y + move_y))
+    return x, y
 
 
 class Player(Sprite):
+    __slots__ = (
+        "game_vars", "input", "type", "shot_delay", "hp",
+        "invincibility_frames",
+    )
+
     def __init__(self, state) -> None:
         super().__init__(state)
         self.game_vars = state.game.game_vars
@@ -20,7 +43,8 @@ class Player(Sprite):
         self.type = EntityType.PLAYER
         self.x = 0
         self.y = 92
-        self.h = 8
+        self.w = WIDTH
+        self.h = HEIGHT
         self.colour = 15  # white
         self.shot_delay = 0
         self.hp = PLAYER_MAX_HP
@@ -28,9 +52,10 @@ class Player(Sprite):
         self.invincibility_frames = INVINCIBILITY_FRAMES
 
     def explode(self):
+        rng = self.game_state.rng
         for i in range(12):
             self.game_state.add_explosion(
-                self.x + px.rndi(-12, 12), self.y - 4 + px.rndi(-6, 6), i * 8
+                self.x + rng.rndi(-12, 12), self.y - 4 + rng.rndi(-6, 6), i * 8
             )
 
     def is_invincible(self):
@@ -44,6 +69,7 @@ class Player(Sprite):
 
     def hit(self):
         """플레이어가 데미지를 받음"""
+        self.game_state.hits_taken += 1
         self.hp -= 1
         if self.hp <= 0:
             self.kill()
@@ -54,6 +80,7 @@ class Player(Sprite):
 
     def kill(self):
         self.remove = True
+        self.game_state.deaths += 1
         self.explode()
         self.game_vars.subtract_life()
         self.game_vars.decrease_all_weapon_levels(2)
@@ -80,17 +107,8 @@ class Player(Sprite):
         elif self.input.is_pressing(input.DOWN):
             move_y = 1
 
-        if move_x != 0 and move_y != 0:
-            move_x *= MOVE_SPEED_DIAGONAL
-            move_y *= MOVE_SPEED_DIAGONAL
-            self.x = max(0, min(APP_WIDTH - self.w, self.x + move_x))
-            self.y = max(16, min(APP_HEIGHT - 16 - self.h, self.y + move_y))
-        elif move_x != 0:
-            move_x *= MOVE_SPEED
-            self.x = max(0, min(APP_WIDTH - self.w, self.x + move_x))
-        elif move_y != 0:
-            move_y *= MOVE_SPEED
-            self.y = max(16, min(APP_HEIGHT - 16 - self.h, self.y + move_y))
+        self.x, self.y = moved_position(self.x, self.y, self.w, self.h,
+                                        move_x, move_y)
 
     def shoot(self):
         if player_shot.create(
@@ -120,6 +138,6 @@ class Player(Sprite):
             self.shoot()
 
     def draw(self):
-        if self.is_invincible() and px.frame_count % 2 == 0:
+        if self.is_invincible() and self.game_state.frame_count % 2 == 0:
             return
         px.blt(self.x, self.y, 0, 0, 4, self.w, self.h, 0)
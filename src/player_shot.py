@@ -15,6 +15,8 @@ DAMAGE = {
 }
 
 class PlayerShot(Sprite):
+    __slots__ = ("type", "velx", "vely", "damage")
+
     def __init__(self, state, x, y, type, lvl, velx, vely) -> None:
         super().__init__(state)
         self.type = EntityType.PLAYER_SHOT
@@ -59,22 +61,23 @@ def create(gs, player_x, player_y, wpn_type, wlvl):
         return False
     
     addshot = gs.add_player_shot
+    new_shot = gs.player_shot_pool.acquire
     if wpn_type == 0: # fwd
-        addshot(PlayerShot(gs, player_x + 12, player_y - 10, 
-                           wpn_type, wlvl, SPEED_LVL[wlvl], 0))
-        addshot(PlayerShot(gs, player_x + 12, player_y + 4, 
-                           wpn_type, wlvl, SPEED_LVL[wlvl], 0))
+        addshot(new_shot(gs, player_x + 12, player_y - 10, 
+                         wpn_type, wlvl, SPEED_LVL[wlvl], 0))
+        addshot(new_shot(gs, player_x + 12, player_y + 4, 
+                         wpn_type, wlvl, SPEED_LVL[wlvl], 0))
     elif wpn_type == 1: # spread/diagonal
         spdx = SPEED_LVL[wlvl] * 0.894
         spdy = SPEED_LVL[wlvl] * 0.447
-        addshot(PlayerShot(gs, player_x + 12, player_y - 10, 
-                           wpn_type, wlvl, spdx, -spdy))
-        addshot(PlayerShot(gs, player_x + 12, player_y + 4, 
-                           wpn_type, wlvl, spdx, +spdy))
+        addshot(new_shot(gs, player_x + 12, player_y - 10, 
+                         wpn_type, wlvl, spdx, -spdy))
+        addshot(new_shot(gs, player_x + 12, player_y + 4, 
+                         wpn_type, wlvl, spdx, +spdy))
     elif wpn_type == 2: # back and fwd
-        addshot(PlayerShot(gs, player_x + 12, player_y - 3, 
-                           wpn_type, wlvl, SPEED_LVL[wlvl], 0))
-        addshot(PlayerShot(gs, player_x - 10, player_y - 3, 
-                           wpn_type, wlvl, -SPEED_LVL[wlvl], 0))
+        addshot(new_shot(gs, player_x + 12, player_y - 3, 
+                         wpn_type, wlvl, SPEED_LVL[wlvl], 0))
+        addshot(new_shot(gs, player_x - 10, player_y - 3, 
+                         wpn_type, wlvl, -SPEED_LVL[wlvl], 0))
 
     return True
\ No newline at end of file
@@ -0,0 +1,323 @@
+"""Batched CPU inference for the actor-critic models in "models".
+
+`load_policy` reads a `.pth` checkpoint without PyTorch: the pickle is
+loaded with an unpickler that only knows the few names a state dict uses,
+and tensors become NumPy arrays over the raw storages in the zip. The
+network is
+
+    shared  Linear(161, 128), ReLU, Linear(128, 128), ReLU
+    actor   Linear(128, 64), ReLU, Linear(64, 10)     -> action logits
+    critic  Linear(128, 64), ReLU, Linear(64, 1)      -> state value
+
+taking one float32 vector of 161 features per request (`input_size`;
+the feature layout is whatever the checkpoint was trained on and is not
+produced by anything in this package) and returning `input.ACTION_INPUTS`
+indices.
+
+`InferenceServer` serves one network to many concurrent callers (threads
+each driving a game): requests queue up and a worker thread runs them as
+one forward pass once `max_batch` are waiting or the oldest has waited
+`max_wait` seconds. Batch sizes and request latencies go into histograms.
+"""
+import bisect
+from concurrent.futures import Future
+import io
+import pickle
+import queue
+import threading
+import time
+import zipfile
+from collections import OrderedDict
+
+import numpy as np
+
+DEFAULT_MAX_BATCH = 64
+DEFAULT_MAX_WAIT = 0.002  # seconds
+
+STORAGE_DTYPES = {
+    "FloatStorage": np.float32,
+    "DoubleStorage": np.float64,
+    "HalfStorage": np.float16,
+    "LongStorage": np.int64,
+    "IntStorage": np.int32,
+    "ShortStorage": np.int16,
+    "CharStorage": np.int8,
+    "ByteStorage": np.uint8,
+    "BoolStorage": np.bool_,
+}
+
+
+def _rebuild_tensor(storage, storage_offset, size, stride, *args):
+    itemsize = storage.itemsize
+    return np.lib.stride_tricks.as_strided(
+        storage[storage_offset:], shape=tuple(size),
+        strides=tuple(s * itemsize for s in stride)).copy()
+
+
+def _rebuild_parameter(data, *args):
+    return data
+
+
+class _CheckpointUnpickler(pickle.Unpickler):
+    """Resolves only what a state dict checkpoint refers to."""
+
+    def __init__(self, data, archive, prefix) -> None:
+        super().__init__(io.BytesIO(data))
+        self.archive = archive
+        self.prefix = prefix
+
+    def find_class(self, module, name):
+        if module == "collections" and name == "OrderedDict":
+            return OrderedDict
+        if module == "torch._utils" and name == "_rebuild_tensor_v2":
+            return _rebuild_tensor
+        if module == "torch._utils" and name == "_rebuild_parameter":
+            return _rebuild_parameter
+        if module == "torch" and name in STORAGE_DTYPES:
+            return name
+        raise pickle.UnpicklingError(f"unsupported {module}.{name} "
+                                     f"in checkpoint")
+
+    def persistent_load(self, pid):
+        # ("storage", storage type, key, location, element count)
+        _, storage_type, key, _, _ = pid
+        dtype = STORAGE_DTYPES[storage_type]
+        raw = self.archive.read(f"{self.prefix}data/{key}")
+        return np.frombuffer(raw, dtype=np.dtype(dtype).newbyteorder("<"))
+
+
+def load_checkpoint(path):
+    """The pickled object of a zip format `.pth`, tensors as NumPy arrays."""
+    with zipfile.ZipFile(path) as archive:
+        pkl = next(n for n in archive.namelist() if n.endswith("/data.pkl"))
+        prefix = pkl[:-len("data.pkl")]
+        return _CheckpointUnpickler(archive.read(pkl), archive,
+                                    prefix).load()
+
+
+class PolicyNet:
+    """NumPy forward pass of the checkpoint's actor-critic network."""
+
+    def __init__(self, state_dict) -> None:
+        def layers(prefix, indices):
+            # weights stored transposed so a batch is `x @ w + b`
+            return [(np.ascontiguousarray(
+                        state_dict[f"{prefix}.{i}.weight"].T, np.float32),
+                     state_dict[f"{prefix}.{i}.bias"].astype(np.float32))
+                    for i in indices]
+
+        self.shared = layers("shared_layers", (0, 2))
+        self.actor = layers("actor", (0, 2))
+        self.critic = layers("critic", (0, 2))
+        self.input_size = self.shared[0][0].shape[0]
+        self.num_actions = self.actor[-1][0].shape[1]
+
+    @staticmethod
+    def _mlp(x, layers, last_relu):
+        for i, (w, b) in enumerate(layers):
+            x = x @ w
+            x += b
+            if last_relu or i < len(layers) - 1:
+                np.maximum(x, 0, out=x)
+        return x
+
+    def forward(self, obs):
+        """(logits, values) for a (batch, input_size) float32 array."""
+        h = self._mlp(obs, self.shared, True)
+        return self._mlp(h, self.actor, False), \
+            self._mlp(h, self.critic, False)[:, 0]
+
+    def act(self, obs, rng=None):
+        """Greedy actions, or sampled from the policy if `rng` is given."""
+        logits = self._mlp(self._mlp(obs, self.shared, True), self.actor,
+                           False)
+        if rng is None:
+            return logits.argmax(axis=1)
+        logits -= logits.max(axis=1, keepdims=True)
+        p = np.exp(logits)
+        cdf = p.cumsum(axis=1)
+        u = rng.random(len(obs)) * cdf[:, -1]
+        return (cdf < u[:, None]).sum(axis=1)
+
+
+def load_policy(path):
+    return PolicyNet(load_checkpoint(path)["network_state_dict"])
+
+
+class Histogram:
+    """Counts per bucket; bucket i holds values up to `edges[i]`, the last
+    one everything above."""
+
+    def __init__(self, edges) -> None:
+        self.edges = tuple(edges)
+        self.counts = [0] * (len(self.edges) + 1)
+        self.total = 0
+        self.sum = 0.0
+
+    def add(self, value):
+        self.counts[bisect.bisect_left(self.edges, value)] += 1
+        self.total += 1
+        self.sum += value
+
+    def mean(self):
+        return self.sum / self.total if self.total else 0.0
+
+    def percentile(self, q):
+        """Upper edge of the bucket holding the `q` (0-100) percentile."""
+        if self.total == 0:
+            return 0.0
+        rank = q / 100 * self.total
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank and c:
+                return self.edges[i] if i < len(self.edges) else float("inf")
+        return float("inf")
+
+    def summary(self):
+        return {
+            "count": self.total,
+            "mean": self.mean(),
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "buckets": list(zip(self.edges + (float("inf"),), self.counts)),
+        }
+
+
+# 10 us .. ~1.3 s, doubling
+LATENCY_EDGES = tuple(1e-5 * 2 ** i for i in range(18))
+
+
+class InferenceServer:
+    def __init__(self, net, max_batch=DEFAULT_MAX_BATCH,
+                 max_wait=DEFAULT_MAX_WAIT, rng=None) -> None:
+        self.net = net
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.rng = rng
+        self.requests = queue.Queue()
+        self._obs = np.zeros((max_batch, net.input_size), dtype=np.float32)
+
+        self.batch_sizes = Histogram(range(1, max_batch + 1))
+        self.latencies = Histogram(LATENCY_EDGES)
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, obs):
+        """Queue one observation; the `Future` resolves to its action, or
+        holds a ValueError if `obs` isn't an (input_size,) vector."""
+        future = Future()
+        shape = np.shape(obs)
+        if shape != (self.net.input_size,):
+            future.set_exception(ValueError(
+                f"observation shape {shape}, expected "
+                f"({self.net.input_size},)"))
+            return future
+        self.requests.put((obs, future, time.perf_counter()))
+        return future
+
+    def act(self, obs):
+        return self.submit(obs).result()
+
+    def close(self):
+        """Serve what is queued, then stop the worker."""
+        self.requests.put(None)
+        self._thread.join()
+
+    def stats(self):
+        return {
+            "batch_size": self.batch_sizes.summary(),
+            "latency": self.latencies.summary(),
+        }
+
+    def _collect(self, first):
+        """`first` and whatever arrives until the batch is full or the
+        oldest request's wait runs out. The second value is False once
+        `close` was called."""
+        batch = [first]
+        deadline = first[2] + self.max_wait
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.perf_counter()
+            try:
+                if timeout > 0:
+                    item = self.requests.get(timeout=timeout)
+                else:
+                    item = self.requests.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, False
+            batch.append(item)
+        return batch, True
+
+    def _run(self):
+        running = True
+        while running:
+            first = self.requests.get()
+            if first is None:
+                break
+            batch, running = self._collect(first)
+
+            n = len(batch)
+            obs = self._obs[:n]
+            try:
+                for i, (o, _, _) in enumerate(batch):
+                    obs[i] = o
+                actions = self.net.act(obs, self.rng)
+            except Exception as e:
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+
+            done = time.perf_counter()
+            for (_, future, submitted), action in zip(batch, actions):
+                future.set_result(int(action))
+                self.latencies.add(done - submitted)
+            self.batch_sizes.add(n)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inference server benchmark")
+    parser.add_argument("model", nargs="?", default="../models/master.pth")
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH)
+    parser.add_argument("--max-wait", type=float, default=DEFAULT_MAX_WAIT)
+    args = parser.parse_args()
+
+    # Throughput only depends on the shapes, so the clients send random
+    # vectors of the network's input size.
+    net = load_policy(args.model)
+    rng = np.random.default_rng()
+    frames = rng.standard_normal((1024, net.input_size), dtype=np.float32)
+
+    server = InferenceServer(net, args.max_batch, args.max_wait)
+
+    def client(k):
+        for i in range(args.requests):
+            server.act(frames[(k * 7919 + i) % len(frames)])
+
+    threads = [threading.Thread(target=client, args=(k,))
+               for k in range(args.clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    server.close()
+
+    total = args.clients * args.requests
+    stats = server.stats()
+    print(f"{total} requests in {elapsed:.2f}s ({total / elapsed:.0f}/s)")
+    b = stats["batch_size"]
+    print(f"batch size: mean {b['mean']:.1f}, p50 {b['p50']}, "
+          f"p90 {b['p90']}, p99 {b['p99']}")
+    lat = stats["latency"]
+    print(f"latency: mean {lat['mean'] * 1e3:.2f}ms, "
+          f"p50 <= {lat['p50'] * 1e3:.2f}ms, "
+          f"p99 <= {lat['p99'] * 1e3:.2f}ms")
@@ -42,6 +42,8 @@ MAX_CYCLE_GAP_LEN = 999999  # every n enemies killed spawn next pup
 
 
 class Powerup(Sprite):
+    __slots__ = ("type", "puptype", "weapon_type")
+
     type_cycle_index = 0
     type_cycle_gap_cnt = 0
 
@@ -51,9 +53,9 @@ class Powerup(Sprite):
         cls.type_cycle_gap_cnt = 0
 
     @classmethod
-    def is_cycle_ready(cls):
+    def is_cycle_ready(cls, gap_len=MAX_CYCLE_GAP_LEN):
         cls.type_cycle_gap_cnt += 1
-        if cls.type_cycle_gap_cnt == MAX_CYCLE_GAP_LEN:
+        if cls.type_cycle_gap_cnt >= gap_len:
             cls.type_cycle_gap_cnt = 0
             cls.type_cycle_index += 1
             if cls.type_cycle_index == MAX_CYCLE_LEN:
@@ -96,14 +98,15 @@ class Powerup(Sprite):
             self.remove = True
             return
 
-        self.y += px.sin(px.frame_count * PI)
+        frame_count = self.game_state.frame_count
+        self.y += px.sin(frame_count * PI)
 
-        if px.frame_count % 5 == 0:
+        if frame_count % 5 == 0:
             self.colour += 1
             if self.colour == MAX_COLOURS:
                 self.colour = 2
 
-        if px.frame_count % 60 == 0:
+        if frame_count % 60 == 0:
             if self.puptype == PowerupType.WEAPON:
                 self.weapon_type += 1
                 if self.weapon_type == MAX_WEAPONS:
@@ -118,5 +121,5 @@ class Powerup(Sprite):
 
 
 def check_create_next(state, x, y):
-    if Powerup.is_cycle_ready():
+    if Powerup.is_cycle_ready(state.difficulty.powerup_gap):
         state.add_powerup(Powerup(state, TYPE_CYCLE[Powerup.type_cycle_index], x, y))
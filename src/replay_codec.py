@@ -0,0 +1,210 @@
+"""Compact replay encoding of `GameDataCollector.export_data()` frames.
+
+Inputs are packed one byte per frame (bit = `input` button index) and run
+length encoded. Lives, score, weapon, stage and the stage clock change
+rarely and are run length encoded too. Player positions are only stored
+as keyframes: every `keyframe_interval` frames and wherever the position
+is not what the previous frame's input moves the player to (spawn,
+respawn). Decoding restores the export_data() schema exactly.
+"""
+from player import moved_position, WIDTH as PLAYER_W, HEIGHT as PLAYER_H
+from input import UP, DOWN, LEFT, RIGHT
+from game_data_collector import INPUT_FIELDS
+
+FORMAT_NAME = "vortexion-replay"
+FORMAT_VERSION = 1
+DEFAULT_KEYFRAME_INTERVAL = 300
+TIMESTAMP_FPS = 30.0  # see GameStateStage._record_frame_data
+
+
+def rle_encode(values):
+    """[v0, v1, ...] -> [value, run, value, run, ...]"""
+    out = []
+    prev = None
+    run = 0
+    for v in values:
+        if run and v == prev:
+            run += 1
+            continue
+        if run:
+            out.append(prev)
+            out.append(run)
+        prev = v
+        run = 1
+    if run:
+        out.append(prev)
+        out.append(run)
+    return out
+
+
+def rle_decode(runs):
+    out = []
+    for i in range(0, len(runs), 2):
+        out.extend([runs[i]] * runs[i + 1])
+    return out
+
+
+def pack_inputs(frame):
+    bits = 0
+    for name, bit in INPUT_FIELDS:
+        if frame[name]:
+            bits |= 1 << bit
+    return bits
+
+
+def predict_position(x, y, inputs):
+    """Where the input of a frame moves the player by the next frame."""
+    move_x = 0
+    move_y = 0
+    if inputs & (1 << LEFT):
+        move_x = -1
+    elif inputs & (1 << RIGHT):
+        move_x = 1
+    if inputs & (1 << UP):
+        move_y = -1
+    elif inputs & (1 << DOWN):
+        move_y = 1
+    return moved_position(x, y, PLAYER_W, PLAYER_H, move_x, move_y)
+
+
+def encode_columns(xs, ys, lives, scores, weapons, inputs, stages,
+                   timestamps, keyframe_interval=DEFAULT_KEYFRAME_INTERVAL):
+    """Encode per-frame columns into the compact "frames" block."""
+    n = len(inputs)
+    positions = []
+    for i in range(n):
+        if i % keyframe_interval == 0 or \
+                predict_position(xs[i - 1], ys[i - 1], inputs[i - 1]) \
+                != (xs[i], ys[i]):
+            positions.append([i, xs[i], ys[i]])
+
+    clock = [round(t * TIMESTAMP_FPS) for t in timestamps]
+    clock_deltas = [c - p for c, p in zip(clock, [0] + clock[:-1])]
+
+    return {
+        "frame_count": n,
+        "keyframe_interval": keyframe_interval,
+        "inputs": rle_encode(inputs),
+        "positions": positions,
+        "lives": rle_encode(lives),
+        "score": rle_encode(scores),
+        "weapon": rle_encode(weapons),
+        "stage": rle_encode(stages),
+        "clock": rle_encode(clock_deltas),
+    }
+
+
+def decode_columns(block):
+    """Inverse of `encode_columns`: dict of per-frame column lists."""
+    n = block["frame_count"]
+    inputs = rle_decode(block["inputs"])
+
+    xs = [0] * n
+    ys = [0] * n
+    keyframes = {p[0]: (p[1], p[2]) for p in block["positions"]}
+    x = y = 0
+    for i in range(n):
+        if i in keyframes:
+            x, y = keyframes[i]
+        else:
+            x, y = predict_position(x, y, inputs[i - 1])
+        xs[i] = float(x)
+        ys[i] = float(y)
+
+    clock = []
+    c = 0
+    for d in rle_decode(block["clock"]):
+        c += d
+        clock.append(c)
+
+    return {
+        "player_x": xs,
+        "player_y": ys,
+        "player_lives": rle_decode(block["lives"]),
+        "player_score": rle_decode(block["score"]),
+        "current_weapon": rle_decode(block["weapon"]),
+        "inputs": inputs,
+        "stage_num": rle_decode(block["stage"]),
+        "timestamp": [float(c) / TIMESTAMP_FPS for c in clock],
+    }
+
+
+def encode(game_data, keyframe_interval=DEFAULT_KEYFRAME_INTERVAL):
+    """export_data() dict -> compact replay dict (JSON serialisable)."""
+    frames = game_data["frames"]
+    for i, f in enumerate(frames):
+        if f["frame_number"] != i:
+            raise ValueError(f"frame {i} has frame_number "
+                             f"{f['frame_number']}, expected consecutive")
+
+    block = encode_columns(
+        [f["player_x"] for f in frames],
+        [f["player_y"] for f in frames],
+        [f["player_lives"] for f in frames],
+        [f["player_score"] for f in frames],
+        [f["current_weapon"] for f in frames],
+        [pack_inputs(f) for f in frames],
+        [f["stage_num"] for f in frames],
+        [f["timestamp"] for f in frames],
+        keyframe_interval,
+    )
+    # Keep key order so a decoded replay serialises like the original.
+    out = {k: (block if k == "frames" else v) for k, v in game_data.items()}
+    out["format"] = FORMAT_NAME
+    out["version"] = FORMAT_VERSION
+    return out
+
+
+def decode(replay):
+    """Compact replay dict -> export_data() dict."""
+    if replay.get("format") != FORMAT_NAME:
+        raise ValueError("not a compact replay")
+    if replay.get("version", 0) > FORMAT_VERSION:
+        raise ValueError(f"unsupported replay version {replay['version']}")
+
+    frames = decode_frames(replay["frames"])
+    return {k: (frames if k == "frames" else v) for k, v in replay.items()
+            if k not in ("format", "version")}
+
+
+def decode_frames(block, start=0):
+    """Frame dicts of an `encode_columns` block, numbered from `start`
+    (where the block begins in the recording)."""
+    cols = decode_columns(block)
+    frames = []
+    for i, bits in enumerate(cols["inputs"]):
+        frame = {
+            "frame_number": start + i,
+            "player_x": cols["player_x"][i],
+            "player_y": cols["player_y"][i],
+            "player_lives": cols["player_lives"][i],
+            "player_score": cols["player_score"][i],
+            "current_weapon": cols["current_weapon"][i],
+        }
+        for name, bit in INPUT_FIELDS:
+            frame[name] = (bits >> bit) & 1
+        frame["stage_num"] = cols["stage_num"][i]
+        frame["timestamp"] = cols["timestamp"][i]
+        frames.append(frame)
+    return frames
+
+
+def is_compact(data):
+    return data.get("format") == FORMAT_NAME
+
+
+def load(path):
+    """Read a replay file in either format as an export_data() dict."""
+    import json
+
+    with open(path, "rt", encoding="utf-8") as fin:
+        data = json.load(fin)
+    return decode(data) if is_compact(data) else data
+
+
+def save(path, game_data, keyframe_interval=DEFAULT_KEYFRAME_INTERVAL):
+    import json
+
+    with open(path, "wt", encoding="utf-8") as fout:
+        json.dump(encode(game_data, keyframe_interval), fout,
+                  separators=(",", ":"))
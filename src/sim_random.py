@@ -0,0 +1,42 @@
+"""Seeded random numbers for gameplay code.
+
+`px.rndi` draws from Pyxel's global generator, which anything else in the
+process can advance, so a re-simulated replay would not reproduce it.
+`SimRandom` is a plain xorshift32 owned by the stage: the same seed gives
+the same sequence on every machine and Python version, and its whole
+state is one int.
+"""
+
+MASK32 = 0xFFFFFFFF
+
+
+def stage_seed(seed, stage_num):
+    """Mix a game seed and stage number into a non-zero 32-bit state."""
+    s = (int(seed) * 0x9E3779B1 + int(stage_num) * 0x85EBCA6B) & MASK32
+    s ^= s >> 16
+    s = (s * 0x7FEB352D) & MASK32
+    s ^= s >> 15
+    return s or 1
+
+
+class SimRandom:
+    def __init__(self, seed=1) -> None:
+        self.state = (int(seed) & MASK32) or 1
+
+    def next_u32(self):
+        s = self.state
+        s ^= (s << 13) & MASK32
+        s ^= s >> 17
+        s ^= (s << 5) & MASK32
+        self.state = s
+        return s
+
+    def rndi(self, a, b):
+        """Random int in [a, b], like `px.rndi`."""
+        if b < a:
+            a, b = b, a
+        return a + self.next_u32() % (b - a + 1)
+
+    def rndf(self, a, b):
+        """Random float in [a, b), like `px.rndf`."""
+        return a + (b - a) * (self.next_u32() / 4294967296.0)
@@ -0,0 +1,82 @@
+
+try:
+    import numpy as np
+except ImportError:  # web build
+    np = None
+
+TILE_SIZE = 8
+
+# Built once per map file and shared by every stage instance using it.
+_cache = {}
+
+
+class SolidTileMap:
+    """One byte per tile of a stage's tile layer: 1 if solid.
+
+    Coordinates outside the map are empty, matching `Tilemap.pget`.
+    """
+    def __init__(self, width, height, solid) -> None:
+        self.width = width
+        self.height = height
+        self.solid = solid
+        self._array = None
+
+    @classmethod
+    def from_tilemap(cls, tilemap, solid_tile_start_row):
+        w = tilemap.width
+        h = tilemap.height
+        solid = bytearray(w * h)
+        pget = tilemap.pget
+        for ty in range(h):
+            row = ty * w
+            for tx in range(w):
+                if pget(tx, ty)[1] >= solid_tile_start_row:
+                    solid[row + tx] = 1
+        return cls(w, h, solid)
+
+    @classmethod
+    def load(cls, map_file, tilemap, solid_tile_start_row):
+        m = _cache.get(map_file)
+        if m is None:
+            m = cls.from_tilemap(tilemap, solid_tile_start_row)
+            _cache[map_file] = m
+        return m
+
+    def is_solid(self, tile_x, tile_y):
+        if 0 <= tile_x < self.width and 0 <= tile_y < self.height:
+            return self.solid[int(tile_y) * self.width + int(tile_x)] == 1
+        return False
+
+    def is_point_solid(self, x, y):
+        return self.is_solid(x // TILE_SIZE, y // TILE_SIZE)
+
+    def is_rect_solid(self, x, y, w, h):
+        """True if any tile touched by the pixel rect is solid."""
+        tx0 = max(0, int(x // TILE_SIZE))
+        ty0 = max(0, int(y // TILE_SIZE))
+        tx1 = min(self.width - 1, int((x + w - 1) // TILE_SIZE))
+        ty1 = min(self.height - 1, int((y + h - 1) // TILE_SIZE))
+        if tx1 < tx0:
+            return False
+        solid = self.solid
+        for ty in range(ty0, ty1 + 1):
+            row = ty * self.width
+            if any(solid[row + tx0:row + tx1 + 1]):
+                return True
+        return False
+
+    def as_array(self):
+        """(height, width) uint8 NumPy view of the bitmap, no copy."""
+        if self._array is None:
+            self._array = np.frombuffer(self.solid, dtype=np.uint8) \
+                .reshape(self.height, self.width)
+        return self._array
+
+    def are_points_solid(self, xs, ys):
+        """Batched `is_point_solid` over NumPy arrays of pixel coords."""
+        tx = np.floor_divide(xs, TILE_SIZE).astype(np.int64)
+        ty = np.floor_divide(ys, TILE_SIZE).astype(np.int64)
+        inside = (tx >= 0) & (tx < self.width) & (ty >= 0) & (ty < self.height)
+        out = np.zeros(inside.shape, dtype=np.bool_)
+        out[inside] = self.as_array()[ty[inside], tx[inside]] != 0
+        return out
@@ -0,0 +1,113 @@
+"""Enemy spawn schedule of a stage, compiled once from its enemy tile layer.
+
+The schedule is a list of (column, row, tile_x) sorted by column then row,
+cached next to the map as "<map>.spawns.json" and rebuilt when the map file
+changes. Run this module from "src" to rebuild every stage's cache.
+"""
+import json
+import os
+import zlib
+
+import pyxel as px
+
+from enemy_spawn import ENEMY_SPAWN_TILE_INDEX_Y
+
+ASSETS_DIR = "assets"
+ENEMIES_TM_INDEX = 1
+MAP_HEIGHT_TILES = 20
+CACHE_VERSION = 1
+
+# Loaded once per map file and shared by every stage instance using it.
+_cache = {}
+
+
+def cache_path(map_file):
+    return os.path.join(ASSETS_DIR, os.path.splitext(map_file)[0]
+                        + ".spawns.json")
+
+
+def _source_crc(map_file):
+    with open(os.path.join(ASSETS_DIR, map_file), "rb") as fin:
+        return zlib.crc32(fin.read())
+
+
+def build(map_file):
+    tilemap = px.Tilemap.from_tmx(os.path.join(ASSETS_DIR, map_file),
+                                  ENEMIES_TM_INDEX)
+    spawns = []
+    for col in range(tilemap.width):
+        for row in range(MAP_HEIGHT_TILES):
+            tile = tilemap.pget(col, row)
+            if tile[1] == ENEMY_SPAWN_TILE_INDEX_Y:
+                spawns.append((col, row, tile[0] << 3))
+    return spawns
+
+
+def save(map_file, spawns, crc):
+    data = {
+        "version": CACHE_VERSION,
+        "source": map_file,
+        "source_crc32": crc,
+        "spawns": spawns,
+    }
+    with open(cache_path(map_file), "wt") as fout:
+        json.dump(data, fout, separators=(",", ":"))
+
+
+def load(map_file):
+    """Spawn schedule for `map_file`, from memory, disk cache or the map."""
+    spawns = _cache.get(map_file)
+    if spawns is not None:
+        return spawns
+
+    crc = _source_crc(map_file)
+    try:
+        with open(cache_path(map_file), "rt") as fin:
+            data = json.load(fin)
+        if data["version"] == CACHE_VERSION and data["source_crc32"] == crc:
+            spawns = [tuple(s) for s in data["spawns"]]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    if spawns is None:
+        spawns = build(map_file)
+        try:
+            save(map_file, spawns, crc)
+        except OSError:
+            pass  # read-only assets, e.g. packaged web build
+
+    _cache[map_file] = spawns
+    return spawns
+
+
+class SpawnCursor:
+    """Walks a schedule as the stage scrolls.
+
+    `take(col)` returns the spawns in `col` and drops any earlier columns
+    still pending, as columns are only ever checked once.
+    """
+    def __init__(self, spawns) -> None:
+        self.spawns = spawns
+        self.index = 0
+
+    def take(self, col):
+        spawns = self.spawns
+        i = self.index
+        n = len(spawns)
+        while i < n and spawns[i][0] < col:
+            i += 1
+        start = i
+        while i < n and spawns[i][0] == col:
+            i += 1
+        self.index = i
+        return spawns[start:i]
+
+
+if __name__ == "__main__":
+    from const import StageNum
+
+    for stage_num in StageNum:
+        map_file = f"stage_{stage_num}.tmx"
+        spawns = build(map_file)
+        save(map_file, spawns, _source_crc(map_file))
+        print(f"{cache_path(map_file)}: {len(spawns)} spawns")
@@ -1,11 +1,13 @@
-
-from itertools import filterfalse
-
 import pyxel as px
 
 from utils import rect_overlap
 
 class Sprite:
+    __slots__ = (
+        "game_state", "x", "y", "w", "h", "remove", "colour", "u", "v",
+        "flip_x", "flip_y",
+    )
+
     def __init__(self, game_state) -> None:
         self.game_state = game_state
         self.x = 0
@@ -37,32 +39,68 @@ class Sprite:
 def sprites_collide(a, b):
     return rect_overlap(a.x, a.y, a.w, a.h, b.x, b.y, b.w, b.h)
 
-def sprites_update(the_list):
+def sprites_update(the_list, pool=None):
+    # Sprites flagged since the last update (collisions) are counted here
+    # too, as they are seen again before being dropped.
+    removed = 0
     for s in the_list:
         s.update()
-    the_list[:] = filterfalse(lambda s: s.remove, the_list)
+        if s.remove:
+            removed += 1
+    if removed:
+        sprites_compact(the_list, pool)
+
+def sprites_compact(the_list, pool=None):
+    """Drop removed sprites in place, keeping the order of the rest."""
+    if pool is not None:
+        for s in the_list:
+            if s.remove:
+                pool.release(s)
+    the_list[:] = [s for s in the_list if not s.remove]
 
 def sprites_draw(the_list):
     for s in the_list:
         s.draw()
 
+class SpriteList(list):
+    """A stage's list of sprites.
+
+    `update` only rebuilds the list on frames where a sprite was removed,
+    instead of filtering it every frame.
+    """
+    __slots__ = ()
+
+    def update(self, pool=None):
+        sprites_update(self, pool)
+
+    def draw(self):
+        sprites_draw(self)
+
 def sprite_lists_collide(list_a, list_b):
     for a in list_a:
         if a.remove:
             continue
+        ax = a.x
+        ay = a.y
+        ax2 = ax + a.w
+        ay2 = ay + a.h
         for b in list_b:
             if b.remove:
                 continue
-            if sprites_collide(a, b):
+            if ax < b.x + b.w and ax2 > b.x and ay < b.y + b.h and ay2 > b.y:
                 a.collided_with(b)
                 b.collided_with(a)
 
 def sprite_collide_list(spr, the_list):
     if spr.remove:
         return
+    sx = spr.x
+    sy = spr.y
+    sx2 = sx + spr.w
+    sy2 = sy + spr.h
     for a in the_list:
         if a.remove:
             continue
-        if sprites_collide(spr, a):
+        if sx < a.x + a.w and sx2 > a.x and sy < a.y + a.h and sy2 > a.y:
             spr.collided_with(a)
             a.collided_with(spr)
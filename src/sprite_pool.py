@@ -0,0 +1,58 @@
+"""Recycling of short-lived sprites (shots, explosions).
+
+A `SpritePool` keeps up to `capacity` spare instances of one sprite class.
+`acquire` re-runs `__init__` on a spare one, so a pooled sprite starts out
+exactly like a new one; removed sprites go back with `release`. The pool is
+filled up front, so play only allocates once more sprites are alive than
+the pool was sized for.
+"""
+
+
+class SpritePool:
+    def __init__(self, cls, capacity) -> None:
+        self.cls = cls
+        self.capacity = capacity
+        self.free = [cls.__new__(cls) for _ in range(capacity)]
+        self.live = 0
+        self.high_water = 0
+        self.allocated = capacity
+        self.dropped = 0
+
+    def acquire(self, *args):
+        if self.free:
+            s = self.free.pop()
+        else:
+            s = self.cls.__new__(self.cls)
+            self.allocated += 1
+        s.__init__(*args)
+        self.live += 1
+        if self.live > self.high_water:
+            self.high_water = self.live
+        return s
+
+    def release(self, s):
+        self.live -= 1
+        if len(self.free) < self.capacity:
+            self.free.append(s)
+        else:
+            self.dropped += 1
+
+    def recycle(self, the_list):
+        """Release every sprite in `the_list` and empty it."""
+        for s in the_list:
+            self.release(s)
+        the_list.clear()
+
+    def reset_live(self, live):
+        """Resync after sprites were created outside the pool (restore)."""
+        self.live = live
+        self.high_water = max(self.high_water, live)
+
+    def stats(self):
+        return {
+            "capacity": self.capacity,
+            "live": self.live,
+            "high_water": self.high_water,
+            "allocated": self.allocated,
+            "dropped": self.dropped,
+        }
@@ -1,9 +1,11 @@
 
 import pyxel as px
 
-from enemy_spawn import ENEMY_SPAWN_TILE_INDEX_Y
 import enemy_spawn
+import spawn_schedule
+from spawn_schedule import SpawnCursor
 from const import EntityType
+from solid_tile_map import SolidTileMap
 from audio import reset_music_gain, fade_out_music, \
     SOUND_CHANNEL_GAIN_DEFAULT
 
@@ -15,10 +17,11 @@ MAP_HEIGHT = 160
 MAP_HEIGHT_TILES = MAP_HEIGHT // 8
 
 TILES_TM_INDEX = 0
-ENEMIES_TM_INDEX = 1
 
 SOLID_TILE_START_ROW = 176//8
 
+SCROLL_X_SPEED = 0.5  # scaled by the stage's difficulty.scroll_speed
+
 SCROLL_X_STOP_STAGE_MUSIC = 208 * 8
 SCROLL_X_START_BOSS_MUSIC = 223 * 8
 
@@ -27,7 +30,7 @@ class StageBackground:
         self.type = EntityType.BACKGROUND
         self.state_stage = state_stage
         self.scroll_x = 0
-        self.scroll_x_speed = 0.5
+        self.scroll_x_speed = SCROLL_X_SPEED
 
         if is_vortex:
             self.map_width = MAP_WIDTH_VORTEX
@@ -40,9 +43,10 @@ class StageBackground:
 
         px.tilemaps[TILES_TM_INDEX] = \
             px.Tilemap.from_tmx("assets/" + map_file, TILES_TM_INDEX)
-        px.tilemaps[ENEMIES_TM_INDEX] = \
-            px.Tilemap.from_tmx("assets/" + map_file, ENEMIES_TM_INDEX)
+        self.solid_tiles = SolidTileMap.load(
+            map_file, px.tilemaps[TILES_TM_INDEX], SOLID_TILE_START_ROW)
         
+        self.spawn_cursor = SpawnCursor(spawn_schedule.load(map_file))
         self.last_col_checked = 0
 
         self.music_gain = SOUND_CHANNEL_GAIN_DEFAULT
@@ -52,24 +56,28 @@ class StageBackground:
 
     def is_point_colliding(self, x, y):
         y -= 16 # offset screen pixels due to hud
-        return self.get_tile(x//8, y//8)[1] >=  SOLID_TILE_START_ROW
+        return self.solid_tiles.is_solid(x//8, y//8)
+
+    def are_points_colliding(self, xs, ys):
+        return self.solid_tiles.are_points_solid(xs, ys - 16)
 
     def check_next_enemy_spawn(self):
         col = (self.scroll_x + VIEW_WIDTH) // 8
         if col > self.last_col_checked:
             self.last_col_checked = col
-            for row in range(MAP_HEIGHT_TILES):
-                tile = px.tilemaps[ENEMIES_TM_INDEX].pget(col, row)
-                if tile[1] == ENEMY_SPAWN_TILE_INDEX_Y:
-                    enemy_spawn.create(self.state_stage, 
-                                       tile[0] << 3, 
-                                       col*8 - self.scroll_x, 
-                                       16 + row*8)
-                    row += 1 # skip down as one below wont be another enemy
+            for _, row, tile_x in self.spawn_cursor.take(col):
+                enemy_spawn.create(self.state_stage, 
+                                   tile_x, 
+                                   col*8 - self.scroll_x, 
+                                   16 + row*8)
 
     def update(self):
-        if self.scroll_x < self.map_width - VIEW_WIDTH:
-            self.scroll_x += self.scroll_x_speed
+        last_scroll_x = self.scroll_x
+        end = self.map_width - VIEW_WIDTH
+        if self.scroll_x < end:
+            self.scroll_x_speed = \
+                SCROLL_X_SPEED * self.state_stage.difficulty.scroll_speed
+            self.scroll_x = min(self.scroll_x + self.scroll_x_speed, end)
         else:
             self.scroll_x_speed = 0
             # No boss on vortex stage, end immediately once at end.
@@ -79,7 +87,7 @@ class StageBackground:
         if self.scroll_x >= SCROLL_X_STOP_STAGE_MUSIC and \
             self.scroll_x < SCROLL_X_START_BOSS_MUSIC:
             self.music_gain = fade_out_music(self.music_gain, 3)
-        elif self.scroll_x == SCROLL_X_START_BOSS_MUSIC:
+        elif last_scroll_x < SCROLL_X_START_BOSS_MUSIC <= self.scroll_x:
             reset_music_gain(3)
             self.state_stage.play_boss_music()
 
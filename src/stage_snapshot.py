@@ -0,0 +1,276 @@
+"""Snapshot and restore of a running `GameStateStage`.
+
+A snapshot is a few flat tuples of scalars rather than a copy of the
+object graph: every sprite contributes its class (as an index into a table
+of per-class field layouts) and its field values, in list order. Fields
+that point back into the game (`game_state`, `input`, `game_vars`) are not
+stored; restore rebinds them to the target stage.
+
+Covered: stage state/timers/clock/RNG, `GameVars` and its `Difficulty`,
+the player and every sprite list, background scroll and spawn cursor, and
+the class-level `Powerup` cycle counters and the enemy id counter. Not
+covered: music, the recorded data and the difficulty telemetry counters.
+
+`to_dict`/`from_dict` convert a snapshot to plain JSON types for storing
+in replay files (see `keyframe_replay`).
+"""
+from enum import Enum
+from operator import attrgetter
+import sys
+
+from powerup import Powerup
+from sprite import Sprite
+
+STAGE_FIELDS = ("state", "state_time", "frame_count", "check_stage_clear")
+BACKGROUND_FIELDS = (
+    "scroll_x",
+    "scroll_x_speed",
+    "vortex_scroll_x",
+    "vortex_scroll_x_speed",
+    "last_col_checked",
+    "music_gain",
+)
+GAME_VARS_FIELDS = (
+    "score",
+    "hi_score",
+    "current_weapon",
+    "lives",
+    "stage_num",
+    "seed",
+)
+SPRITE_LISTS = (
+    "player_shots",
+    "enemies",
+    "enemy_shots",
+    "bosses",
+    "explosions",
+    "powerups",
+)
+
+# Back references, rebound on restore instead of stored.
+REF_FIELDS = {
+    "game_state": lambda stage: stage,
+    "input": lambda stage: stage.input,
+    "game_vars": lambda stage: stage.game.game_vars,
+}
+
+
+def slot_names(cls):
+    """Every `__slots__` entry of a sprite class, base classes first."""
+    names = []
+    for c in reversed(cls.__mro__):
+        names.extend(c.__dict__.get("__slots__", ()))
+    return tuple(names)
+
+
+class Layout:
+    """Stored fields of one sprite class, in `slot_names` order."""
+
+    def __init__(self, index, cls, names) -> None:
+        self.index = index
+        self.cls = cls
+        self.refs = tuple(n for n in names if n in REF_FIELDS)
+        self.fields = tuple(n for n in names if n not in REF_FIELDS)
+        self.get = attrgetter(*self.fields)
+
+
+class StageSnapshot:
+    def __init__(self, stage_num, scalars, weapon_levels, layouts, kinds,
+                 counts, values, difficulty=None) -> None:
+        self.stage_num = stage_num
+        self.scalars = scalars
+        self.weapon_levels = weapon_levels
+        self.layouts = layouts  # tuple of Layout, indexed by kinds
+        self.kinds = kinds      # layout index per sprite, player first
+        self.counts = counts    # sprites per SPRITE_LISTS entry
+        self.values = values    # every sprite's fields, flattened
+        # Difficulty.values(); None in snapshots from before it existed
+        self.difficulty = difficulty
+
+    @property
+    def frame_count(self):
+        return self.scalars[STAGE_FIELDS.index("frame_count")]
+
+
+class SnapshotWriter:
+    """Takes snapshots, reusing the per-class layouts between calls."""
+
+    def __init__(self) -> None:
+        self.layouts = []
+        self._by_class = {}
+
+    def _layout(self, sprite):
+        cls = type(sprite)
+        layout = self._by_class.get(cls)
+        if layout is None:
+            layout = Layout(len(self.layouts), cls, slot_names(cls))
+            self.layouts.append(layout)
+            self._by_class[cls] = layout
+        return layout
+
+    def take(self, stage):
+        background = stage.background
+        game_vars = stage.game.game_vars
+        scalars = (
+            tuple(getattr(stage, f) for f in STAGE_FIELDS)
+            + tuple(getattr(background, f) for f in BACKGROUND_FIELDS)
+            + tuple(getattr(game_vars, f) for f in GAME_VARS_FIELDS)
+            + (
+                stage.rng.state,
+                background.spawn_cursor.index,
+                Powerup.type_cycle_index,
+                Powerup.type_cycle_gap_cnt,
+                stage.game.data_collector.enemy_id_counter,
+            )
+        )
+
+        kinds = []
+        counts = []
+        values = []
+        layout = self._layout(stage.player)
+        kinds.append(layout.index)
+        values.extend(layout.get(stage.player))
+        for name in SPRITE_LISTS:
+            sprites = getattr(stage, name)
+            counts.append(len(sprites))
+            for s in sprites:
+                layout = self._layout(s)
+                kinds.append(layout.index)
+                values.extend(layout.get(s))
+
+        return StageSnapshot(
+            game_vars.stage_num,
+            scalars,
+            tuple(game_vars.weapon_levels),
+            tuple(self.layouts),
+            tuple(kinds),
+            tuple(counts),
+            tuple(values),
+            game_vars.difficulty.values(),
+        )
+
+
+_writer = SnapshotWriter()
+
+
+def take(stage):
+    return _writer.take(stage)
+
+
+def restore(stage, snap):
+    """Put `stage` back into the state captured by `snap`.
+
+    `stage` must be playing the same stage number; its sprites are replaced
+    by fresh objects so the snapshot can be restored again later.
+    """
+    game_vars = stage.game.game_vars
+    if game_vars.stage_num != snap.stage_num:
+        raise ValueError(f"snapshot is of stage {snap.stage_num}, "
+                         f"not stage {game_vars.stage_num}")
+
+    background = stage.background
+    scalars = snap.scalars
+    i = 0
+    for target, fields in ((stage, STAGE_FIELDS),
+                           (background, BACKGROUND_FIELDS),
+                           (game_vars, GAME_VARS_FIELDS)):
+        for f in fields:
+            setattr(target, f, scalars[i])
+            i += 1
+    stage.rng.state = scalars[i]
+    background.spawn_cursor.index = scalars[i + 1]
+    Powerup.type_cycle_index = scalars[i + 2]
+    Powerup.type_cycle_gap_cnt = scalars[i + 3]
+    stage.game.data_collector.enemy_id_counter = scalars[i + 4]
+    game_vars.weapon_levels[:] = snap.weapon_levels
+    if snap.difficulty is not None:
+        game_vars.difficulty.set_values(snap.difficulty)
+
+    refs = {name: get(stage) for name, get in REF_FIELDS.items()}
+    layouts = snap.layouts
+    values = snap.values
+    pos = 0
+
+    def build(kind):
+        nonlocal pos
+        layout = layouts[kind]
+        cls = layout.cls
+        s = cls.__new__(cls)
+        for name in layout.refs:
+            setattr(s, name, refs[name])
+        for name in layout.fields:
+            setattr(s, name, values[pos])
+            pos += 1
+        return s
+
+    kinds = iter(snap.kinds)
+    stage.player = build(next(kinds))
+    stage.hud.player = stage.player
+    for name, count in zip(SPRITE_LISTS, snap.counts):
+        getattr(stage, name)[:] = [build(next(kinds)) for _ in range(count)]
+
+
+def _enum_types():
+    from const import EntityType, StageNum
+    from game_state_stage import State
+    from powerup import PowerupType
+
+    return {t.__name__: t for t in (EntityType, StageNum, State, PowerupType)}
+
+
+def _encode(v):
+    if isinstance(v, Enum):
+        return [type(v).__name__, v.name]
+    return v
+
+
+def _decode(v, enum_types):
+    if isinstance(v, list):
+        return enum_types[v[0]][v[1]]
+    return v
+
+
+def _sprite_class(module, name):
+    # Only classes already loaded by the game, never import from file data.
+    cls = getattr(sys.modules.get(module), name, None)
+    if not (isinstance(cls, type) and issubclass(cls, Sprite)):
+        raise ValueError(f"unknown sprite class {module}.{name}")
+    return cls
+
+
+def to_dict(snap):
+    """Snapshot as JSON serialisable lists; enums become [type, name].
+    "difficulty" is left out for snapshots taken without it."""
+    data = {
+        "stage_num": int(snap.stage_num),
+        "scalars": [_encode(v) for v in snap.scalars],
+        "weapon_levels": list(snap.weapon_levels),
+        "layouts": [[layout.cls.__module__, layout.cls.__name__,
+                     list(layout.refs), list(layout.fields)]
+                    for layout in snap.layouts],
+        "kinds": list(snap.kinds),
+        "counts": list(snap.counts),
+        "values": [_encode(v) for v in snap.values],
+    }
+    if snap.difficulty is not None:
+        data["difficulty"] = list(snap.difficulty)
+    return data
+
+
+def from_dict(data):
+    enum_types = _enum_types()
+    layouts = tuple(
+        Layout(i, _sprite_class(module, name), tuple(refs) + tuple(fields))
+        for i, (module, name, refs, fields) in enumerate(data["layouts"])
+    )
+    return StageSnapshot(
+        enum_types["StageNum"](data["stage_num"]),
+        tuple(_decode(v, enum_types) for v in data["scalars"]),
+        tuple(data["weapon_levels"]),
+        layouts,
+        tuple(data["kinds"]),
+        tuple(data["counts"]),
+        tuple(_decode(v, enum_types) for v in data["values"]),
+        None if data.get("difficulty") is None
+        else tuple(data["difficulty"]),
+    )
@@ -0,0 +1,221 @@
+"""N headless stages stepped in lockstep with stacked NumPy outputs."""
+import numpy as np
+
+from const import StageNum
+from enemy_shot_arrays import SharedEnemyShots
+from headless import StageEnv
+from powerup import Powerup
+
+# Per-env observation row.
+OBS_PLAYER_X = 0
+OBS_PLAYER_Y = 1
+OBS_PLAYER_HP = 2
+OBS_LIVES = 3
+OBS_SCORE = 4
+OBS_WEAPON = 5
+OBS_NUM_ENEMIES = 6
+OBS_NUM_BOSSES = 7
+OBS_NUM_ENEMY_SHOTS = 8
+OBS_SIZE = 9
+
+
+def write_observation(env, row):
+    """Write the observation of a `StageEnv` into a float32 row in place."""
+    stage = env.stage
+    player = stage.player
+    game_vars = env.game.game_vars
+    row[OBS_PLAYER_X] = player.x
+    row[OBS_PLAYER_Y] = player.y
+    row[OBS_PLAYER_HP] = player.hp
+    row[OBS_LIVES] = game_vars.lives
+    row[OBS_SCORE] = game_vars.score
+    row[OBS_WEAPON] = game_vars.current_weapon
+    row[OBS_NUM_ENEMIES] = len(stage.enemies)
+    row[OBS_NUM_BOSSES] = len(stage.bosses)
+    row[OBS_NUM_ENEMY_SHOTS] = len(stage.enemy_shots)
+
+
+class VecStageEnv:
+    """`num_envs` independent episodes of the same stage, stepped together.
+
+    `step(actions)` advances every env one frame and writes the results
+    into shared observation, reward and done arrays; they are overwritten
+    by the next call. Finished envs are reset straight away, so their
+    observation row is the first one of the next episode and `dones` flags
+    the boundary.
+
+    The envs' enemy shots live in one `SharedEnemyShots`, so each frame
+    moves, culls and collides the shots of all envs in one pass. The rest
+    of `GameStateStage.update` runs per env, split into the phases around
+    that pass. Results are identical to stepping `num_envs` `StageEnv`s
+    with the same seeds and actions one after another.
+
+    Env i runs `seeds[i]` (0, 1, 2, ... by default) on every episode. The
+    other keyword arguments are passed on to each `StageEnv`.
+
+    With an `encoder` (`obs_encoder.ObservationEncoder`,
+    `grid_obs.GridEncoder`) each env's observation is its encoding instead
+    of the `OBS_*` summary row.
+
+    The `Powerup` type cycle is class state in `powerup.py`; it is kept per
+    env here and swapped in around each env's phases so the envs stay
+    independent within one process.
+    """
+
+    def __init__(self, num_envs, stage_num=StageNum.STAGE_1, auto_fire=True,
+                 max_steps=0, encoder=None, seeds=None,
+                 adaptive_difficulty=False) -> None:
+        if seeds is None:
+            seeds = range(num_envs)
+        elif len(seeds) != num_envs:
+            raise ValueError(f"{len(seeds)} seeds for {num_envs} envs")
+        self.num_envs = num_envs
+        self.shots = SharedEnemyShots(num_envs)
+        self.envs = [StageEnv(stage_num, auto_fire, max_steps, seed=seed,
+                              batched_shots=self.shots.slot(i),
+                              adaptive_difficulty=adaptive_difficulty)
+                     for i, seed in enumerate(seeds)]
+        self.encoder = encoder
+
+        if encoder is None:
+            self.obs = np.zeros((num_envs, OBS_SIZE), dtype=np.float32)
+        else:
+            self.obs = np.zeros((num_envs,) + encoder.shape,
+                                dtype=encoder.dtype)
+        self.rewards = np.zeros(num_envs, dtype=np.float32)
+        self.dones = np.zeros(num_envs, dtype=np.bool_)
+
+        # (type_cycle_index, type_cycle_gap_cnt) per env
+        self._pup_cycles = [(0, 0)] * num_envs
+
+        self.episode_scores = np.zeros(num_envs, dtype=np.int32)
+        self.episode_steps = np.zeros(num_envs, dtype=np.int32)
+
+        # Envs whose stage got past update_world this frame (not paused or
+        # game over).
+        self._active = np.zeros(num_envs, dtype=np.bool_)
+        self._frame_counts = np.zeros(num_envs, dtype=np.int64)
+
+    def _reset_env(self, i):
+        self.envs[i].reset()
+        self._swap_out(i)
+        self._write_row(i)
+
+    def _write_row(self, i):
+        env = self.envs[i]
+        if self.encoder is None:
+            write_observation(env, self.obs[i])
+        else:
+            self.encoder.encode(env.stage, self.obs[i])
+
+    def reset(self):
+        for i in range(self.num_envs):
+            self._reset_env(i)
+        self.rewards[:] = 0
+        self.dones[:] = False
+        return self.obs
+
+    def _swap_in(self, i):
+        Powerup.type_cycle_index, Powerup.type_cycle_gap_cnt = \
+            self._pup_cycles[i]
+
+    def _swap_out(self, i):
+        self._pup_cycles[i] = (Powerup.type_cycle_index,
+                               Powerup.type_cycle_gap_cnt)
+
+    def step(self, actions):
+        """Advance every env with `actions[i]`.
+
+        Returns (observations, rewards, dones).
+        """
+        envs = self.envs
+        stages = [env.stage for env in envs]
+        swap_in = self._swap_in
+        swap_out = self._swap_out
+
+        # GameStateStage.update phase by phase, enemy shots for all envs at
+        # once.
+        running = []
+        for i, stage in enumerate(stages):
+            envs[i].begin_step(int(actions[i]))
+            swap_in(i)
+            if stage.update_world():
+                running.append(i)
+            swap_out(i)
+        self._active[:] = False
+        self._active[running] = True
+        self._frame_counts[:] = [stage.frame_count for stage in stages]
+
+        # All envs play the same stage, so any background has their map.
+        self.shots.update_envs(self._active, self._frame_counts,
+                               stages[0].background)
+        for i in running:
+            swap_in(i)
+            stages[i].collide_world()
+            swap_out(i)
+        self.shots.collide_players(self._active,
+                                   [stage.player for stage in stages])
+        for i in running:
+            swap_in(i)
+            stages[i].update_end()
+            swap_out(i)
+
+        for i, env in enumerate(envs):
+            env.end_step()
+            self.rewards[i] = env.reward
+            self.dones[i] = env.done
+            if env.done:
+                self.episode_scores[i] = env.game.game_vars.score
+                self.episode_steps[i] = env.steps
+                self._reset_env(i)
+            else:
+                self._write_row(i)
+
+        return self.obs, self.rewards, self.dones
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    from headless import NUM_ACTIONS
+
+    parser = argparse.ArgumentParser(description="Vectorized stage benchmark")
+    parser.add_argument("--envs", type=int, default=64)
+    parser.add_argument("--steps", type=int, default=1000)
+    parser.add_argument("--stage", type=int, default=int(StageNum.STAGE_1))
+    args = parser.parse_args()
+
+    actions = np.random.default_rng().integers(
+        0, NUM_ACTIONS, (args.steps, args.envs))
+    frames = args.envs * args.steps
+
+    # The same episodes as separate StageEnvs, one step() call each.
+    envs = [StageEnv(args.stage, seed=i) for i in range(args.envs)]
+    for env in envs:
+        env.reset()
+    cycles = [(Powerup.type_cycle_index, Powerup.type_cycle_gap_cnt)] * \
+        args.envs
+    obs = np.zeros((args.envs, OBS_SIZE), dtype=np.float32)
+    start = time.perf_counter()
+    for step_actions in actions:
+        for i, env in enumerate(envs):
+            Powerup.type_cycle_index, Powerup.type_cycle_gap_cnt = cycles[i]
+            env.step(int(step_actions[i]))
+            if env.done:
+                env.reset()
+            cycles[i] = (Powerup.type_cycle_index, Powerup.type_cycle_gap_cnt)
+            write_observation(env, obs[i])
+    single = frames / (time.perf_counter() - start)
+
+    vec = VecStageEnv(args.envs, args.stage)
+    vec.reset()
+    episodes = 0
+    start = time.perf_counter()
+    for step_actions in actions:
+        _, _, dones = vec.step(step_actions)
+        episodes += int(dones.sum())
+    elapsed = time.perf_counter() - start
+    print(f"{frames} frames, {episodes} episodes in {elapsed:.2f}s "
+          f"({frames / elapsed:.0f} frames/s, "
+          f"{args.envs} StageEnvs: {single:.0f} frames/s)")